@@ -4,16 +4,20 @@ API dependencies
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from uuid import UUID
+from typing import Optional
 import jwt
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.user import User
 from app.core.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
     """Get current authenticated user"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -29,7 +33,9 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except jwt.PyJWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username, User.is_active == True).first()
+    user = await db.scalar(
+        select(User).where(User.username == username, User.is_active == True).limit(1)
+    )
     if user is None:
         raise credentials_exception
     
@@ -43,3 +49,16 @@ async def get_current_active_superuser(current_user: User = Depends(get_current_
             detail="Not enough permissions"
         )
     return current_user
+
+def keyset_after(created_at_column, id_column, cursor: Optional[datetime], cursor_id: Optional[UUID] = None):
+    """
+    Predicate for keyset pagination over rows ordered newest first
+    
+    Selects rows strictly after the (cursor, cursor_id) position; cursor_id
+    breaks ties between rows created in the same transaction.
+    """
+    if cursor is None:
+        return true()
+    if cursor_id is None:
+        return created_at_column < cursor
+    return tuple_(created_at_column, id_column) < tuple_(cursor, cursor_id)
@@ -2,46 +2,54 @@
 Structural analysis API routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from typing import List, Optional
 import uuid
+from uuid import UUID
 from datetime import datetime
+from redis.asyncio import Redis
 
-from app.db.database import get_db
-from app.models.project import StructuralModel, AnalysisResult
+from app.db.database import get_async_db
+from app.db.redis import get_redis
+from app.models.project import Project, StructuralModel, AnalysisResult
 from app.models.user import User
 from app.schemas.analysis import (
     AnalysisRequest,
     AnalysisJob,
     AnalysisResults,
     AnalysisResultSummary,
-    AnalysisStatus
+    AnalysisStatus,
+    ELEMENT_RESULT_LIST_ADAPTER,
+    node_result_columns
 )
-from app.api.dependencies import get_current_user
-from app.core.analysis.engine import AnalysisEngine
-from app.core.analysis.linear import LinearAnalysis
-from app.core.analysis.nonlinear import NonlinearAnalysis
+from app.api.dependencies import get_current_user, keyset_after
+from app.core import jobs
+from app.core.analysis.tasks import run_analysis_job
 
 router = APIRouter()
 
-# In-memory job tracking (in production, use Redis or database)
-analysis_jobs: Dict[str, Dict[str, Any]] = {}
-
 @router.post("/run", response_model=AnalysisJob)
 async def run_analysis(
     request: AnalysisRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    r: Redis = Depends(get_redis),
     current_user: User = Depends(get_current_user)
 ):
     """Start structural analysis"""
     
-    # Verify model exists and user has access
-    model = db.query(StructuralModel).filter(
-        StructuralModel.id == request.model_id,
-        StructuralModel.is_active == True
-    ).first()
+    # Verify model exists and user has access (one JOINed query)
+    model = (await db.execute(
+        select(StructuralModel.id, Project.owner_id).join(
+            Project, StructuralModel.project_id == Project.id
+        ).where(
+            StructuralModel.id == request.model_id,
+            StructuralModel.is_active == True
+        ).limit(1)
+    )).first()
     
     if not model:
         raise HTTPException(
@@ -50,7 +58,7 @@ async def run_analysis(
         )
     
     # Verify project ownership
-    if model.project.owner_id != current_user.id:
+    if model.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
@@ -69,222 +77,174 @@ async def run_analysis(
         "request": request
     }
     
-    analysis_jobs[job_id] = job
+    await jobs.create_job(r, job)
     
-    # Start analysis in background
-    background_tasks.add_task(
-        run_analysis_task,
-        job_id,
-        request,
-        db
-    )
+    # Queue analysis on a Celery worker so the API process stays responsive
+    run_analysis_job.delay(job_id, request.model_dump(mode="json"))
     
     return AnalysisJob(**job)
 
-async def run_analysis_task(
-    job_id: str,
-    request: AnalysisRequest,
-    db: Session
-):
-    """Background task to run analysis"""
-    
-    job = analysis_jobs[job_id]
-    
-    try:
-        # Update job status
-        job["status"] = AnalysisStatus.RUNNING
-        job["started_at"] = datetime.utcnow()
-        job["progress"] = 10.0
-        
-        # Get model data
-        model = db.query(StructuralModel).filter(
-            StructuralModel.id == request.model_id
-        ).first()
-        
-        # Initialize analysis engine
-        engine = AnalysisEngine(model)
-        job["progress"] = 20.0
-        
-        # Run analysis based on type
-        if request.settings.analysis_type == "linear":
-            analyzer = LinearAnalysis(engine)
-        elif request.settings.analysis_type == "nonlinear":
-            analyzer = NonlinearAnalysis(engine)
-        else:
-            raise ValueError(f"Unsupported analysis type: {request.settings.analysis_type}")
-        
-        job["progress"] = 30.0
-        
-        # Execute analysis
-        results = await analyzer.run(request.load_case_ids, request.settings)
-        job["progress"] = 90.0
-        
-        # Save results if requested
-        if request.save_results:
-            for load_case_id, result in results.items():
-                db_result = AnalysisResult(
-                    model_id=request.model_id,
-                    analysis_type=request.settings.analysis_type,
-                    load_case_id=load_case_id,
-                    node_results=result["node_results"],
-                    element_results=result["element_results"],
-                    analysis_time=result["analysis_time"],
-                    convergence_info=result["convergence_info"]
-                )
-                db.add(db_result)
-            
-            db.commit()
-        
-        # Update job completion
-        job["status"] = AnalysisStatus.COMPLETED
-        job["completed_at"] = datetime.utcnow()
-        job["progress"] = 100.0
-        job["results"] = results
-        
-    except Exception as e:
-        job["status"] = AnalysisStatus.FAILED
-        job["error_message"] = str(e)
-        job["completed_at"] = datetime.utcnow()
-
 @router.get("/jobs/{job_id}", response_model=AnalysisJob)
 async def get_analysis_job(
     job_id: str,
+    r: Redis = Depends(get_redis),
     current_user: User = Depends(get_current_user)
 ):
     """Get analysis job status"""
     
-    if job_id not in analysis_jobs:
+    job = await jobs.get_job(r, job_id)
+    
+    if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Analysis job not found"
         )
     
-    job = analysis_jobs[job_id]
     return AnalysisJob(**job)
 
 @router.get("/models/{model_id}/results", response_model=List[AnalysisResultSummary])
 async def get_analysis_results(
-    model_id: str,
-    db: Session = Depends(get_db),
+    model_id: UUID,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[datetime] = None,
+    cursor_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get analysis results for a model"""
+    """
+    Get analysis results for a model, newest first
+    
+    Pass the created_at and id of the last result received as cursor and
+    cursor_id to fetch the next page.
+    """
     
     # Verify model access
-    model = db.query(StructuralModel).filter(
-        StructuralModel.id == model_id,
-        StructuralModel.is_active == True
-    ).first()
+    owner_id = await db.scalar(
+        select(Project.owner_id).join(
+            StructuralModel, StructuralModel.project_id == Project.id
+        ).where(
+            StructuralModel.id == model_id,
+            StructuralModel.is_active == True
+        )
+    )
     
-    if not model or model.project.owner_id != current_user.id:
+    if owner_id is None or owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Model not found or access denied"
         )
     
-    results = db.query(AnalysisResult).filter(
-        AnalysisResult.model_id == model_id
-    ).all()
+    # Summary statistics are precomputed at save time, so only scalar
+    # columns are selected here and the JSON result blobs are never loaded.
+    # Rows are streamed from a server-side cursor in batches.
+    results = await db.stream(
+        select(
+            AnalysisResult.id,
+            AnalysisResult.model_id,
+            AnalysisResult.analysis_type,
+            AnalysisResult.load_case_id,
+            AnalysisResult.analysis_time,
+            AnalysisResult.created_at,
+            AnalysisResult.max_displacement,
+            AnalysisResult.max_stress,
+            AnalysisResult.max_reaction
+        ).where(
+            AnalysisResult.model_id == model_id,
+            keyset_after(AnalysisResult.created_at, AnalysisResult.id, cursor, cursor_id)
+        ).order_by(
+            AnalysisResult.created_at.desc(),
+            AnalysisResult.id.desc()
+        ).limit(limit).execution_options(yield_per=100)
+    )
     
-    # Convert to summary format
-    summaries = []
-    for result in results:
-        # Calculate summary statistics
-        max_displacement = 0.0
-        max_stress = 0.0
-        max_reaction = 0.0
-        
-        # Extract max values from results
-        if result.node_results:
-            for node_result in result.node_results.values():
-                if isinstance(node_result, dict):
-                    displacements = node_result.get("displacements", {})
-                    reactions = node_result.get("reactions", {})
-                    
-                    max_displacement = max(max_displacement, 
-                                         max(abs(v) for v in displacements.values() if isinstance(v, (int, float))))
-                    max_reaction = max(max_reaction,
-                                     max(abs(v) for v in reactions.values() if isinstance(v, (int, float))))
-        
-        if result.element_results:
-            for elem_result in result.element_results.values():
-                if isinstance(elem_result, dict):
-                    stresses = elem_result.get("stresses", {})
-                    max_stress = max(max_stress,
-                                   max(abs(v) for v in stresses.values() if isinstance(v, (int, float))))
-        
-        summary = AnalysisResultSummary(
+    return [
+        AnalysisResultSummary(
             id=result.id,
             model_id=result.model_id,
             analysis_type=result.analysis_type,
             load_case_id=result.load_case_id,
             analysis_time=result.analysis_time or 0.0,
             created_at=result.created_at,
-            max_displacement=max_displacement,
-            max_stress=max_stress,
-            max_reaction=max_reaction
+            max_displacement=result.max_displacement or 0.0,
+            max_stress=result.max_stress or 0.0,
+            max_reaction=result.max_reaction or 0.0
         )
-        summaries.append(summary)
-    
-    return summaries
+        async for result in results
+    ]
 
 @router.get("/results/{result_id}", response_model=AnalysisResults)
 async def get_analysis_result_detail(
-    result_id: str,
-    db: Session = Depends(get_db),
+    result_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get detailed analysis results"""
     
-    result = db.query(AnalysisResult).filter(
-        AnalysisResult.id == result_id
-    ).first()
-    
-    if not result:
+    # The deferred result blobs are loaded up front: an AsyncSession cannot
+    # lazy-load them on attribute access
+    row = (await db.execute(
+        select(AnalysisResult, Project.owner_id).join(
+            StructuralModel, AnalysisResult.model_id == StructuralModel.id
+        ).join(
+            Project, StructuralModel.project_id == Project.id
+        ).where(
+            AnalysisResult.id == result_id
+        ).options(undefer_group("results")).limit(1)
+    )).first()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Analysis result not found"
         )
     
+    result, owner_id = row
+    
     # Verify access
-    if result.model.project.owner_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
     
-    return AnalysisResults(
+    results = AnalysisResults(
         model_id=result.model_id,
         load_case_id=result.load_case_id,
         analysis_type=result.analysis_type,
-        node_results=[],  # Convert from JSON storage
-        element_results=[],  # Convert from JSON storage
+        # Stored results are keyed by node/element number
+        **node_result_columns(result.node_results or {}),
+        element_results=ELEMENT_RESULT_LIST_ADAPTER.validate_python([
+            {'element_id': element_number, **element_result}
+            for element_number, element_result in (result.element_results or {}).items()
+        ]),
         analysis_time=result.analysis_time or 0.0,
         convergence_info=result.convergence_info or {}
     )
+    
+    # Returned as a response so the (large) model is not validated again
+    # against response_model; orjson writes the result arrays directly
+    return ORJSONResponse(content=results.model_dump())
 
 @router.delete("/jobs/{job_id}")
 async def cancel_analysis_job(
     job_id: str,
+    r: Redis = Depends(get_redis),
     current_user: User = Depends(get_current_user)
 ):
     """Cancel a running analysis job"""
     
-    if job_id not in analysis_jobs:
+    previous_status = await jobs.cancel_job(r, job_id)
+    
+    if previous_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Analysis job not found"
         )
     
-    job = analysis_jobs[job_id]
-    
-    if job["status"] in [AnalysisStatus.COMPLETED, AnalysisStatus.FAILED, AnalysisStatus.CANCELLED]:
+    if previous_status in jobs.FINISHED_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot cancel completed or failed job"
         )
     
-    job["status"] = AnalysisStatus.CANCELLED
-    job["completed_at"] = datetime.utcnow()
-    
     return {"message": "Analysis job cancelled"}
@@ -2,11 +2,14 @@
 Project management API routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.project import Project, StructuralModel
 from app.models.user import User
 from app.schemas.project import (
@@ -17,52 +20,65 @@ from app.schemas.project import (
     StructuralModelCreate,
     StructuralModelUpdate
 )
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, keyset_after
 
 router = APIRouter()
 
+# The response schemas defer their validator build; build them now, as the
+# router is mounted at startup, rather than on the first request
+ProjectSchema.model_rebuild()
+StructuralModelSchema.model_rebuild()
+
 @router.post("/", response_model=ProjectSchema)
 async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new project"""
-    db_project = Project(
-        **project.dict(),
-        owner_id=current_user.id
-    )
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
-    return db_project
+    # INSERT ... RETURNING brings back server defaults without a refresh SELECT
+    db_project = (await db.execute(
+        insert(Project).values(
+            **project.model_dump(),
+            owner_id=current_user.id
+        ).returning(Project)
+    )).scalar_one()
+    
+    # Serialize before commit so the expired instance is not reloaded
+    response = ProjectSchema.model_validate(db_project)
+    await db.commit()
+    return response
 
 @router.get("/", response_model=List[ProjectSchema])
 async def get_projects(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user's projects"""
-    projects = db.query(Project).filter(
-        Project.owner_id == current_user.id,
-        Project.is_active == True
-    ).offset(skip).limit(limit).all()
-    return projects
+    projects = await db.scalars(
+        select(Project).where(
+            Project.owner_id == current_user.id,
+            Project.is_active == True
+        ).offset(skip).limit(limit)
+    )
+    return projects.all()
 
 @router.get("/{project_id}", response_model=ProjectSchema)
 async def get_project(
-    project_id: str,
-    db: Session = Depends(get_db),
+    project_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific project"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id,
-        Project.is_active == True
-    ).first()
+    project = await db.scalar(
+        select(Project).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id,
+            Project.is_active == True
+        ).limit(1)
+    )
     
     if not project:
         raise HTTPException(
@@ -74,17 +90,26 @@ async def get_project(
 
 @router.put("/{project_id}", response_model=ProjectSchema)
 async def update_project(
-    project_id: str,
+    project_id: UUID,
     project_update: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update a project"""
-    project = db.query(Project).filter(
+    ownership = (
         Project.id == project_id,
         Project.owner_id == current_user.id,
         Project.is_active == True
-    ).first()
+    )
+    update_data = project_update.model_dump(exclude_unset=True)
+    
+    if update_data:
+        # Single UPDATE ... RETURNING instead of SELECT + UPDATE + refresh
+        project = (await db.execute(
+            update(Project).where(*ownership).values(**update_data).returning(Project)
+        )).scalar_one_or_none()
+    else:
+        project = await db.scalar(select(Project).where(*ownership).limit(1))
     
     if not project:
         raise HTTPException(
@@ -92,26 +117,25 @@ async def update_project(
             detail="Project not found"
         )
     
-    update_data = project_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(project, field, value)
-    
-    db.commit()
-    db.refresh(project)
-    return project
+    # Serialize before commit so the expired instance is not reloaded
+    response = ProjectSchema.model_validate(project)
+    await db.commit()
+    return response
 
 @router.delete("/{project_id}")
 async def delete_project(
-    project_id: str,
-    db: Session = Depends(get_db),
+    project_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a project (soft delete)"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id,
-        Project.is_active == True
-    ).first()
+    project = await db.scalar(
+        select(Project).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id,
+            Project.is_active == True
+        ).limit(1)
+    )
     
     if not project:
         raise HTTPException(
@@ -120,64 +144,86 @@ async def delete_project(
         )
     
     project.is_active = False
-    db.commit()
+    await db.commit()
     
     return {"message": "Project deleted successfully"}
 
 # Structural Model endpoints
 @router.post("/{project_id}/models", response_model=StructuralModelSchema)
 async def create_structural_model(
-    project_id: str,
+    project_id: UUID,
     model: StructuralModelCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new structural model"""
-    # Verify project ownership
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id,
-        Project.is_active == True
-    ).first()
+    # Verify project ownership (SELECT EXISTS, no project columns fetched)
+    has_access = await db.scalar(
+        select(
+            select(Project.id).where(
+                Project.id == project_id,
+                Project.owner_id == current_user.id,
+                Project.is_active == True
+            ).exists()
+        )
+    )
     
-    if not project:
+    if not has_access:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    db_model = StructuralModel(
-        **model.dict(),
-        project_id=project_id
-    )
-    db.add(db_model)
-    db.commit()
-    db.refresh(db_model)
-    return db_model
+    db_model = (await db.execute(
+        insert(StructuralModel).values(
+            {**model.model_dump(), "project_id": project_id}
+        ).returning(StructuralModel)
+    )).scalar_one()
+    
+    response = StructuralModelSchema.model_validate(db_model)
+    await db.commit()
+    return response
 
 @router.get("/{project_id}/models", response_model=List[StructuralModelSchema])
 async def get_structural_models(
-    project_id: str,
-    db: Session = Depends(get_db),
+    project_id: UUID,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[datetime] = None,
+    cursor_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get structural models for a project"""
-    # Verify project ownership
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id,
-        Project.is_active == True
-    ).first()
+    """
+    Get structural models for a project, newest first
     
-    if not project:
+    Pass the created_at and id of the last model received as cursor and
+    cursor_id to fetch the next page.
+    """
+    # Ownership check and model fetch in one query: the outer join yields a
+    # single (project_id, None) row for an owned project without models.
+    # The page predicate lives in the join condition so that row survives.
+    rows = (await db.execute(
+        select(Project.id, StructuralModel).outerjoin(
+            StructuralModel,
+            and_(
+                StructuralModel.project_id == Project.id,
+                StructuralModel.is_active == True,
+                keyset_after(StructuralModel.created_at, StructuralModel.id, cursor, cursor_id)
+            )
+        ).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id,
+            Project.is_active == True
+        ).order_by(
+            StructuralModel.created_at.desc(),
+            StructuralModel.id.desc()
+        ).limit(limit)
+    )).all()
+    
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    models = db.query(StructuralModel).filter(
-        StructuralModel.project_id == project_id,
-        StructuralModel.is_active == True
-    ).all()
-    
-    return models
+    return [model for _, model in rows if model is not None]
@@ -4,19 +4,58 @@ This module provides the foundation for all analysis types
 """
 
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
+import scipy.sparse as sp
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+from uuid import UUID
 from dataclasses import dataclass
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 from app.models.project import StructuralModel, Node, Element, Material, Section, LoadCase
+from app.core.analysis.kernels import NUMBA_AVAILABLE, assemble_local_k_all, scatter_triplets
+from app.core.analysis.solvers import RESIDUAL_TOLERANCE, Solver, analyze, factorize, relative_residual
+from app.schemas.analysis import DOF_NAMES
 
 logger = logging.getLogger(__name__)
 
+# Nodal load components, in DOF index order
+FORCE_NAMES = ['Fx', 'Fy', 'Fz', 'Mx', 'My', 'Mz']
+
+# Elements per chunk when element matrices are computed on a thread pool
+ASSEMBLY_CHUNK_SIZE = 4096
+
+# Contraction order for the blockwise rotation R^T K_ab R, planned once per
+# process. The element axis n is shared by every operand, so the optimal path
+# does not depend on the number of elements.
+ROTATE_BLOCKS_SUBSCRIPTS = 'nki,nakbl,nlj->naibj'
+ROTATE_BLOCKS_PATH = np.einsum_path(
+    ROTATE_BLOCKS_SUBSCRIPTS,
+    np.empty((1, 3, 3)), np.empty((1, 4, 3, 4, 3)), np.empty((1, 3, 3)),
+    optimize='optimal'
+)[0]
+
+# Polled between outer solver iterations; returns True once the job is cancelled
+CancelCheck = Callable[[], Awaitable[bool]]
+
+class AnalysisCancelled(Exception):
+    """Raised when a running analysis has been cancelled"""
+
+async def raise_if_cancelled(is_cancelled: Optional[CancelCheck]) -> None:
+    """Stop the analysis if cancellation has been requested"""
+    if is_cancelled is not None and await is_cancelled():
+        raise AnalysisCancelled()
+
+def _same_buffer(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> bool:
+    """True if both arrays view the same memory, e.g. the indices of CSR matrices sharing one pattern"""
+    if a is None or b is None:
+        return False
+    return a.shape == b.shape and a.__array_interface__['data'][0] == b.__array_interface__['data'][0]
+
 @dataclass
 class AnalysisNode:
-    """Analysis node representation"""
-    id: str
+    """Analysis node view, built on demand from the engine arrays"""
+    id: UUID
     node_id: int
     coordinates: np.ndarray  # [x, y, z]
     restraints: Dict[str, bool]  # DOF restraints
@@ -24,8 +63,8 @@ class AnalysisNode:
 
 @dataclass
 class AnalysisElement:
-    """Analysis element representation"""
-    id: str
+    """Analysis element view, built on demand from the engine arrays"""
+    id: UUID
     element_id: int
     element_type: str
     start_node: AnalysisNode
@@ -34,7 +73,6 @@ class AnalysisElement:
     section: Dict[str, Any]
     local_axes: np.ndarray  # Local coordinate system
     length: float
-    stiffness_matrix: Optional[np.ndarray] = None
 
 class AnalysisEngine:
     """
@@ -48,21 +86,78 @@ class AnalysisEngine:
     def __init__(self, model: StructuralModel):
         """Initialize analysis engine with structural model"""
         self.model = model
-        self.nodes: Dict[str, AnalysisNode] = {}
-        self.elements: Dict[str, AnalysisElement] = {}
-        self.materials: Dict[str, Dict[str, Any]] = {}
-        self.sections: Dict[str, Dict[str, Any]] = {}
-        self.load_cases: Dict[str, Dict[str, Any]] = {}
+        self.materials: Dict[UUID, Dict[str, Any]] = {}
+        self.sections: Dict[UUID, Dict[str, Any]] = {}
+        self.load_cases: Dict[UUID, Dict[str, Any]] = {}
+        
+        # Struct-of-arrays node data, rows in model node order
+        self.node_ids: List[UUID] = []
+        self.node_numbers = np.empty(0, dtype=np.int64)
+        self.node_id_to_index: Dict[UUID, int] = {}
+        self.coords = np.empty((0, 3))
+        # Restrained DOFs packed one bit per DOF (bit i is DOF_NAMES[i])
+        self.restraint_bits = np.empty(0, dtype=np.uint8)
+        self.dof_index = np.empty((0, 6), dtype=np.int32)
+        
+        # Material (E, G) and section (A, J, Iy, Iz) tables; the last row holds
+        # the defaults used by elements referencing an unknown material/section
+        self.material_id_to_index: Dict[UUID, int] = {}
+        self.section_id_to_index: Dict[UUID, int] = {}
+        self.material_props = np.array([[200000.0, 80000.0]])
+        self.section_props = np.array([[1.0, 1.0, 1.0, 1.0]])
+        
+        # Material/section property dicts by table row, materialized once; the
+        # last row is {} for unknown materials/sections
+        self.material_rows: List[Dict[str, Any]] = [{}]
+        self.section_rows: List[Dict[str, Any]] = [{}]
+        
+        # Section rigidities (EA, GJ, EIy, EIz) per distinct (material, section) pair
+        self.group_constants = np.empty((0, 4))
+        
+        # Struct-of-arrays element data, rows in model element order
+        self.elem_ids: List[UUID] = []
+        self.elem_numbers = np.empty(0, dtype=np.int64)
+        self.element_id_to_index: Dict[UUID, int] = {}
+        self.elem_types: List[str] = []
+        self.elem_nodes = np.empty((0, 2), dtype=np.int32)
+        self.elem_material = np.empty(0, dtype=np.int32)
+        self.elem_section = np.empty(0, dtype=np.int32)
+        self.elem_group = np.empty(0, dtype=np.int32)
+        self.elem_L = np.empty(0)
+        self.local_axes = np.empty((0, 3, 3))
+        
+        # Data-array positions of element entries in a fixed CSR pattern (see assemble_sparse)
+        self._pattern_indices: Optional[np.ndarray] = None
+        self._pattern_free = np.empty(0, dtype=bool)
+        self._pattern_slots = np.empty(0, dtype=np.int64)
+        
+        # Local element stiffness matrices from the last assembly, reused for force recovery
+        self.K_local_all: Optional[np.ndarray] = None
         
         # Analysis matrices
-        self.global_stiffness: Optional[np.ndarray] = None
+        self.global_stiffness: Optional[sp.csr_array] = None
         self.global_mass: Optional[np.ndarray] = None
         self.global_damping: Optional[np.ndarray] = None
         
+        # Factorization of the last solved stiffness matrix, reused across load cases
+        self._factored_matrix: Optional[sp.sparray] = None
+        self._solver: Optional[Solver] = None
+        
+        # Symbolic analysis of the last factored sparsity pattern, reused when
+        # only the values change (Newton iterations on a fixed pattern)
+        self._symbolic_indices: Optional[np.ndarray] = None
+        self._symbolic: Optional[Any] = None
+        
+        # Factor in float32 and refine in float64 (set from analysis settings)
+        self.mixed_precision = False
+        
         # DOF management
         self.total_dofs = 0
-        self.free_dofs: List[int] = []
-        self.restrained_dofs: List[int] = []
+        self.free_dofs = np.empty(0, dtype=np.int64)
+        self.restrained_dofs = np.empty(0, dtype=np.int64)
+        
+        # Global DOF indices per element (n_elements, 12), -1 where restrained
+        self.elem_dofs = np.empty((0, 12), dtype=np.int64)
         
         # Results storage
         self.displacements: Optional[np.ndarray] = None
@@ -91,7 +186,7 @@ class AnalysisEngine:
             self._assign_dofs()
             
             logger.info(f"Model preparation complete. Total DOFs: {self.total_dofs}")
-            
+        
         except Exception as e:
             logger.error(f"Error preparing model: {e}")
             raise
@@ -110,6 +205,13 @@ class AnalysisEngine:
                 'fu': material.ultimate_strength or 400.0,  # Default ultimate strength
                 'properties': material.properties or {}
             }
+        
+        self.material_id_to_index = {material_id: index for index, material_id in enumerate(self.materials)}
+        self.material_rows = list(self.materials.values()) + [{}]
+        self.material_props = np.array(
+            [[material['E'], material['G']] for material in self.material_rows[:-1]] + [[200000.0, 80000.0]],
+            dtype=np.float64
+        )
     
     def _process_sections(self) -> None:
         """Process section properties"""
@@ -126,219 +228,376 @@ class AnalysisEngine:
                 'dimensions': section.dimensions or {},
                 'properties': section.properties or {}
             }
+        
+        self.section_id_to_index = {section_id: index for index, section_id in enumerate(self.sections)}
+        self.section_rows = list(self.sections.values()) + [{}]
+        self.section_props = np.array(
+            [[section['A'], section['J'], section['Iy'], section['Iz']] for section in self.section_rows[:-1]] + [[1.0, 1.0, 1.0, 1.0]],
+            dtype=np.float64
+        )
     
     def _process_nodes(self) -> None:
-        """Process structural nodes"""
-        for node in self.model.nodes:
-            coordinates = np.array([node.x, node.y, node.z])
-            
-            # Default restraints (all free)
-            restraints = {
-                'dx': False, 'dy': False, 'dz': False,
-                'rx': False, 'ry': False, 'rz': False
-            }
-            restraints.update(node.restraints or {})
+        """Process structural nodes into preallocated arrays"""
+        model_nodes = self.model.nodes
+        n_nodes = len(model_nodes)
+        
+        self.node_ids = [None] * n_nodes
+        self.node_numbers = np.empty(n_nodes, dtype=np.int64)
+        self.coords = np.empty((n_nodes, 3), dtype=np.float64)
+        self.restraint_bits = np.zeros(n_nodes, dtype=np.uint8)
+        
+        for k, node in enumerate(model_nodes):
+            self.node_ids[k] = node.id
+            self.node_numbers[k] = node.node_id
+            self.coords[k] = (node.x, node.y, node.z)
             
-            analysis_node = AnalysisNode(
-                id=node.id,
-                node_id=node.node_id,
-                coordinates=coordinates,
-                restraints=restraints,
-                dof_indices=[]  # Will be assigned later
-            )
-            
-            self.nodes[node.id] = analysis_node
+            # Unlisted DOFs are free
+            if node.restraints:
+                self.restraint_bits[k] = sum(
+                    1 << bit for bit, dof_name in enumerate(DOF_NAMES) if node.restraints.get(dof_name, False)
+                )
+        
+        self.node_id_to_index = {node_id: index for index, node_id in enumerate(self.node_ids)}
     
     def _process_elements(self) -> None:
-        """Process structural elements"""
-        for element in self.model.elements:
-            start_node = self.nodes[element.start_node_id]
-            end_node = self.nodes[element.end_node_id]
-            
-            # Calculate element length and local axes
-            vector = end_node.coordinates - start_node.coordinates
-            length = np.linalg.norm(vector)
-            
-            if length < 1e-6:
-                raise ValueError(f"Element {element.element_id} has zero length")
-            
-            # Local coordinate system (simplified - assumes vertical Y-axis)
-            local_x = vector / length
-            local_z = np.array([0, 0, 1])
-            
-            # Handle vertical elements
-            if abs(np.dot(local_x, local_z)) > 0.9:
-                local_z = np.array([1, 0, 0])
-            
-            local_y = np.cross(local_z, local_x)
-            local_y = local_y / np.linalg.norm(local_y)
-            local_z = np.cross(local_x, local_y)
-            
-            local_axes = np.column_stack([local_x, local_y, local_z])
-            
-            # Get material and section properties
-            material = self.materials.get(element.material_id, {})
-            section = self.sections.get(element.section_id, {})
-            
-            analysis_element = AnalysisElement(
-                id=element.id,
-                element_id=element.element_id,
-                element_type=element.element_type,
-                start_node=start_node,
-                end_node=end_node,
-                material=material,
-                section=section,
-                local_axes=local_axes,
-                length=length
-            )
-            
-            self.elements[element.id] = analysis_element
+        """Process structural elements into preallocated arrays"""
+        model_elements = self.model.elements
+        n_elements = len(model_elements)
+        
+        # Unknown material/section ids map to the defaults row
+        default_material = len(self.materials)
+        default_section = len(self.sections)
+        
+        self.elem_ids = [None] * n_elements
+        self.elem_types = [None] * n_elements
+        self.elem_numbers = np.empty(n_elements, dtype=np.int64)
+        self.elem_nodes = np.empty((n_elements, 2), dtype=np.int32)
+        self.elem_material = np.empty(n_elements, dtype=np.int32)
+        self.elem_section = np.empty(n_elements, dtype=np.int32)
+        
+        for k, element in enumerate(model_elements):
+            self.elem_ids[k] = element.id
+            self.elem_types[k] = element.element_type
+            self.elem_numbers[k] = element.element_id
+            self.elem_nodes[k] = (self.node_id_to_index[element.start_node_id], self.node_id_to_index[element.end_node_id])
+            self.elem_material[k] = self.material_id_to_index.get(element.material_id, default_material)
+            self.elem_section[k] = self.section_id_to_index.get(element.section_id, default_section)
+        
+        self.element_id_to_index = {element_id: index for index, element_id in enumerate(self.elem_ids)}
+        
+        # Calculate element lengths and local axes for all elements at once
+        vectors = self.coords[self.elem_nodes[:, 1]] - self.coords[self.elem_nodes[:, 0]]
+        lengths = np.linalg.norm(vectors, axis=1)
+        
+        zero_length = lengths < 1e-6
+        if zero_length.any():
+            raise ValueError(f"Element {self.elem_numbers[int(np.argmax(zero_length))]} has zero length")
+        
+        # Local coordinate system (simplified - assumes vertical Y-axis)
+        local_x = vectors / lengths[:, None]
+        local_z = np.tile([0.0, 0.0, 1.0], (n_elements, 1))
+        
+        # Handle vertical elements
+        local_z[np.abs(local_x[:, 2]) > 0.9] = [1.0, 0.0, 0.0]
+        
+        local_y = np.cross(local_z, local_x)
+        local_y /= np.linalg.norm(local_y, axis=1)[:, None]
+        local_z = np.cross(local_x, local_y)
+        
+        # Axes as columns, (n_elements, 3, 3)
+        self.local_axes = np.stack([local_x, local_y, local_z], axis=2)
+        self.elem_L = lengths
+        
+        # Elements sharing a (material, section) pair share their section rigidities
+        pair_keys = self.elem_material.astype(np.int64) * (default_section + 1) + self.elem_section
+        group_keys, elem_group = np.unique(pair_keys, return_inverse=True)
+        self.elem_group = elem_group.astype(np.int32).reshape(-1)
+        
+        E, G = self.material_props[group_keys // (default_section + 1)].T
+        A, J, Iy, Iz = self.section_props[group_keys % (default_section + 1)].T
+        self.group_constants = np.column_stack([E * A, G * J, E * Iy, E * Iz]).reshape(-1, 4)
+    
+    def get_node(self, node_id: UUID) -> Optional[AnalysisNode]:
+        """Object view of a node for external callers (not used by the analysis itself)"""
+        index = self.node_id_to_index.get(node_id)
+        if index is None:
+            return None
+        
+        return AnalysisNode(
+            id=node_id,
+            node_id=int(self.node_numbers[index]),
+            coordinates=self.coords[index].copy(),
+            restraints={dof_name: bool(self.restraint_bits[index] >> bit & 1) for bit, dof_name in enumerate(DOF_NAMES)},
+            dof_indices=self.dof_index[index].tolist() if len(self.dof_index) else []
+        )
+    
+    def get_element(self, element_id: UUID) -> Optional[AnalysisElement]:
+        """Object view of an element for external callers (not used by the analysis itself)"""
+        index = self.element_id_to_index.get(element_id)
+        if index is None:
+            return None
+        
+        return AnalysisElement(
+            id=element_id,
+            element_id=int(self.elem_numbers[index]),
+            element_type=self.elem_types[index],
+            start_node=self.get_node(self.node_ids[self.elem_nodes[index, 0]]),
+            end_node=self.get_node(self.node_ids[self.elem_nodes[index, 1]]),
+            material=self.material_rows[self.elem_material[index]],
+            section=self.section_rows[self.elem_section[index]],
+            local_axes=self.local_axes[index],
+            length=float(self.elem_L[index])
+        )
+    
+    def element_sections(self) -> List[Dict[str, Any]]:
+        """Section properties per element, in row order ({} where the section is unknown)"""
+        sections = self.section_rows
+        return [sections[index] for index in self.elem_section.tolist()]
     
     def _process_load_cases(self) -> None:
         """Process load cases"""
         for load_case in self.model.load_cases:
+            loads = load_case.loads or []
+            load_node_index, load_values = self._pack_nodal_loads(loads)
+            
             self.load_cases[load_case.id] = {
                 'name': load_case.name,
                 'type': load_case.load_type,
-                'loads': load_case.loads or [],
+                'loads': loads,
+                'load_node_index': load_node_index,
+                'load_values': load_values,
                 'properties': load_case.properties or {}
             }
     
-    def _assign_dofs(self) -> None:
-        """Assign degrees of freedom to nodes"""
-        dof_counter = 0
+    def _pack_nodal_loads(self, loads: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pack the nodal loads of a load case into arrays
+        
+        Returns:
+            Node row index per load (n_loads,) and force components per load
+            (n_loads, 6) in DOF order, zero where a component is absent
+        """
+        node_indices = []
+        values = []
         
-        # 6 DOFs per node (3 translations + 3 rotations)
-        for node in self.nodes.values():
-            node_dofs = []
+        for load in loads:
+            if load.get('type') != 'nodal':
+                continue
             
-            for dof_name in ['dx', 'dy', 'dz', 'rx', 'ry', 'rz']:
-                if not node.restraints.get(dof_name, False):
-                    # Free DOF
-                    node_dofs.append(dof_counter)
-                    self.free_dofs.append(dof_counter)
-                else:
-                    # Restrained DOF
-                    node_dofs.append(-1)  # Mark as restrained
-                    self.restrained_dofs.append(dof_counter)
-                
-                dof_counter += 1
+            # Loads are stored as JSON, so node ids usually arrive as strings
+            node_id = load.get('node_id')
+            try:
+                index = self.node_id_to_index.get(node_id if isinstance(node_id, UUID) else UUID(node_id))
+            except (TypeError, ValueError, AttributeError):
+                index = None
+            if index is None:
+                logger.warning(f"Node {node_id} not found for nodal load")
+                continue
             
-            node.dof_indices = node_dofs
+            forces = load.get('forces', {})
+            node_indices.append(index)
+            values.append([forces.get(force_name, 0.0) for force_name in FORCE_NAMES])
+        
+        return np.array(node_indices, dtype=np.int32), np.array(values, dtype=np.float64).reshape(-1, 6)
+    
+    def _assign_dofs(self) -> None:
+        """Assign degrees of freedom to nodes"""
+        # 6 DOFs per node (3 translations + 3 rotations), flattened node-major
+        restrained = np.unpackbits(self.restraint_bits[:, None], axis=1, bitorder='little')[:, :6]
+        free = restrained.ravel() == 0
+        
+        # Free DOFs are numbered consecutively; restrained DOFs are marked -1
+        self.dof_index = np.where(free, np.cumsum(free) - 1, -1).astype(np.int32).reshape(-1, 6)
+        self.free_dofs = np.nonzero(free)[0]
+        self.restrained_dofs = np.nonzero(~free)[0]
+        self.elem_dofs = self.dof_index[self.elem_nodes].reshape(-1, 12).astype(np.int64)
         
         self.total_dofs = len(self.free_dofs)
         logger.info(f"DOF assignment complete. Free DOFs: {self.total_dofs}")
     
-    def assemble_global_stiffness(self) -> np.ndarray:
+    def assemble_global_stiffness(self) -> sp.csr_array:
         """
         Assemble global stiffness matrix
         
         Returns:
-            Global stiffness matrix for free DOFs only
+            Sparse global stiffness matrix for free DOFs only
         """
         logger.info("Assembling global stiffness matrix...")
         
-        # Initialize global stiffness matrix
-        K_global = np.zeros((self.total_dofs, self.total_dofs))
-        
-        for element in self.elements.values():
-            # Calculate element stiffness matrix
-            K_element = self._calculate_element_stiffness(element)
-            
-            # Get element DOF indices
-            start_dofs = element.start_node.dof_indices
-            end_dofs = element.end_node.dof_indices
-            element_dofs = start_dofs + end_dofs
-            
-            # Assemble into global matrix
-            for i, global_i in enumerate(element_dofs):
-                if global_i >= 0:  # Free DOF
-                    for j, global_j in enumerate(element_dofs):
-                        if global_j >= 0:  # Free DOF
-                            K_global[global_i, global_j] += K_element[i, j]
+        K_global = self.assemble_sparse(self._calculate_element_stiffness())
         
         self.global_stiffness = K_global
-        logger.info("Global stiffness matrix assembled")
+        logger.info(f"Global stiffness matrix assembled ({K_global.nnz} nonzeros)")
         
         return K_global
     
-    def _calculate_element_stiffness(self, element: AnalysisElement) -> np.ndarray:
+    def assemble_sparse(self, element_matrices: np.ndarray, pattern: Optional[sp.csr_array] = None) -> sp.csr_array:
+        """
+        Assemble 12x12 element matrices into a sparse global matrix
+        
+        Element entries are laid out as COO triplets, one 144-entry block per
+        element in model element order; entries on restrained DOFs (index -1)
+        are masked out and duplicates are summed by the COO to CSR conversion.
+        
+        Args:
+            element_matrices: (n_elements, 12, 12) stack of element matrices
+            pattern: A matrix previously returned by assemble_sparse; the result
+                then shares its indices and indptr and only the values are summed
+        """
+        if pattern is not None:
+            return self._assemble_into_pattern(element_matrices, pattern)
+        
+        element_dofs = self.elem_dofs
+        
+        if NUMBA_AVAILABLE:
+            n_entries = len(element_dofs) * 144
+            rows = np.empty(n_entries, dtype=np.int64)
+            cols = np.empty(n_entries, dtype=np.int64)
+            data = np.empty(n_entries, dtype=np.float64)
+            scatter_triplets(element_dofs, element_matrices, rows, cols, data)
+        else:
+            rows = np.repeat(element_dofs, 12, axis=1).ravel()
+            cols = np.tile(element_dofs, 12).ravel()
+            data = element_matrices.reshape(-1)
+        
+        free = (rows >= 0) & (cols >= 0)
+        return sp.coo_array(
+            (data[free], (rows[free], cols[free])),
+            shape=(self.total_dofs, self.total_dofs)
+        ).tocsr()
+    
+    def _assemble_into_pattern(self, element_matrices: np.ndarray, pattern: sp.csr_array) -> sp.csr_array:
+        """Sum element matrices straight into the data array of a fixed CSR pattern"""
+        if not _same_buffer(self._pattern_indices, pattern.indices):
+            # Position of every free element entry in the pattern's data array,
+            # located once per pattern by searching the sorted (row, col) keys
+            pattern.sum_duplicates()
+            n = self.total_dofs
+            rows = np.repeat(self.elem_dofs, 12, axis=1).ravel()
+            cols = np.tile(self.elem_dofs, 12).ravel()
+            free = (rows >= 0) & (cols >= 0)
+            pattern_keys = np.repeat(np.arange(n, dtype=np.int64), np.diff(pattern.indptr)) * n + pattern.indices
+            
+            self._pattern_free = free
+            self._pattern_slots = np.searchsorted(pattern_keys, rows[free] * n + cols[free])
+            self._pattern_indices = pattern.indices
+        
+        data = np.bincount(
+            self._pattern_slots,
+            weights=element_matrices.reshape(-1)[self._pattern_free],
+            minlength=pattern.nnz
+        )
+        return sp.csr_array((data, pattern.indices, pattern.indptr), shape=pattern.shape)
+    
+    def _calculate_element_stiffness(self) -> np.ndarray:
         """
-        Calculate element stiffness matrix in global coordinates
+        Calculate the stiffness matrices of all elements in global coordinates
         
         This is a simplified implementation for frame elements.
         Production code would have specialized methods for different element types.
+        
+        Returns:
+            (n_elements, 12, 12) stack of element stiffness matrices
+        """
+        if NUMBA_AVAILABLE:
+            # Compiled kernel writes straight into preallocated output buffers
+            self.K_local_all = np.empty((len(self.elem_L), 12, 12))
+            K_elements = np.empty((len(self.elem_L), 12, 12))
+            assemble_local_k_all(
+                self.group_constants, self.elem_group, self.elem_L, self.local_axes,
+                self.K_local_all, K_elements
+            )
+            return K_elements
+        
+        n = len(self.elem_L)
+        self.K_local_all = np.empty((n, 12, 12))
+        K_elements = np.empty((n, 12, 12))
+        
+        # Large models are processed in element chunks on a thread pool; the
+        # NumPy kernels release the GIL and each chunk writes disjoint rows
+        chunks = [slice(start, min(start + ASSEMBLY_CHUNK_SIZE, n)) for start in range(0, n, ASSEMBLY_CHUNK_SIZE)]
+        
+        if len(chunks) > 1:
+            with ThreadPoolExecutor() as pool:
+                list(pool.map(lambda chunk: self._calculate_element_stiffness_chunk(chunk, K_elements), chunks))
+        else:
+            for chunk in chunks:
+                self._calculate_element_stiffness_chunk(chunk, K_elements)
+        
+        return K_elements
+    
+    def _calculate_element_stiffness_chunk(self, chunk: slice, out: np.ndarray) -> None:
+        """Calculate local and global element stiffness matrices for a slice of elements"""
+        self.K_local_all[chunk] = self._calculate_local_stiffness(chunk)
+        out[chunk] = self.rotate_to_global(self.K_local_all[chunk], chunk)
+    
+    def rotate_to_global(self, K_local: np.ndarray, chunk: slice = slice(None)) -> np.ndarray:
         """
-        # Material and section properties
-        E = element.material.get('E', 200000.0)
-        G = element.material.get('G', 80000.0)
-        A = element.section.get('A', 1.0)
-        Iy = element.section.get('Iy', 1.0)
-        Iz = element.section.get('Iz', 1.0)
-        J = element.section.get('J', 1.0)
-        L = element.length
-        
-        # Local stiffness matrix for 3D frame element (12x12)
-        K_local = np.zeros((12, 12))
+        Transform local element matrices (n x 12 x 12) of a slice of elements to global coordinates
+        
+        T is block-diagonal with four copies of the element rotation R, so
+        T^T K T is computed as R^T K_ab R on each of the sixteen 3x3 blocks
+        instead of as two dense 12x12 products.
+        """
+        R = self.local_axes[chunk]
+        K_blocks = K_local.reshape(-1, 4, 3, 4, 3)
+        return np.einsum(ROTATE_BLOCKS_SUBSCRIPTS, R, K_blocks, R, optimize=ROTATE_BLOCKS_PATH).reshape(-1, 12, 12)
+    
+    def _calculate_local_stiffness(self, chunk: slice = slice(None)) -> np.ndarray:
+        """Calculate the stiffness matrices of elements in local coordinates (n x 12 x 12)"""
+        EA, GJ, EIy, EIz = self.group_constants[self.elem_group[chunk]].T
+        L = self.elem_L[chunk]
+        
+        # Shared stiffness coefficients, computed once (divisions instead of pow)
+        eAL = EA / L
+        gJL = GJ / L
+        eIzL = EIz / L
+        eIzL2 = eIzL / L
+        eIzL3 = eIzL2 / L
+        eIyL = EIy / L
+        eIyL2 = eIyL / L
+        eIyL3 = eIyL2 / L
+        
+        # Local stiffness matrices for 3D frame elements (n x 12 x 12)
+        K_local = np.zeros((len(L), 12, 12))
         
         # Axial terms
-        K_local[0, 0] = K_local[6, 6] = E * A / L
-        K_local[0, 6] = K_local[6, 0] = -E * A / L
+        K_local[:, 0, 0] = K_local[:, 6, 6] = eAL
+        K_local[:, 0, 6] = K_local[:, 6, 0] = -eAL
         
         # Torsional terms
-        K_local[3, 3] = K_local[9, 9] = G * J / L
-        K_local[3, 9] = K_local[9, 3] = -G * J / L
+        K_local[:, 3, 3] = K_local[:, 9, 9] = gJL
+        K_local[:, 3, 9] = K_local[:, 9, 3] = -gJL
         
         # Bending terms (Y-axis)
-        K_local[1, 1] = K_local[7, 7] = 12 * E * Iz / (L**3)
-        K_local[1, 7] = K_local[7, 1] = -12 * E * Iz / (L**3)
-        K_local[1, 5] = K_local[5, 1] = 6 * E * Iz / (L**2)
-        K_local[1, 11] = K_local[11, 1] = 6 * E * Iz / (L**2)
-        K_local[7, 5] = K_local[5, 7] = -6 * E * Iz / (L**2)
-        K_local[7, 11] = K_local[11, 7] = -6 * E * Iz / (L**2)
-        K_local[5, 5] = K_local[11, 11] = 4 * E * Iz / L
-        K_local[5, 11] = K_local[11, 5] = 2 * E * Iz / L
+        K_local[:, 1, 1] = K_local[:, 7, 7] = 12 * eIzL3
+        K_local[:, 1, 7] = K_local[:, 7, 1] = -12 * eIzL3
+        K_local[:, 1, 5] = K_local[:, 5, 1] = 6 * eIzL2
+        K_local[:, 1, 11] = K_local[:, 11, 1] = 6 * eIzL2
+        K_local[:, 7, 5] = K_local[:, 5, 7] = -6 * eIzL2
+        K_local[:, 7, 11] = K_local[:, 11, 7] = -6 * eIzL2
+        K_local[:, 5, 5] = K_local[:, 11, 11] = 4 * eIzL
+        K_local[:, 5, 11] = K_local[:, 11, 5] = 2 * eIzL
         
         # Bending terms (Z-axis)
-        K_local[2, 2] = K_local[8, 8] = 12 * E * Iy / (L**3)
-        K_local[2, 8] = K_local[8, 2] = -12 * E * Iy / (L**3)
-        K_local[2, 4] = K_local[4, 2] = -6 * E * Iy / (L**2)
-        K_local[2, 10] = K_local[10, 2] = -6 * E * Iy / (L**2)
-        K_local[8, 4] = K_local[4, 8] = 6 * E * Iy / (L**2)
-        K_local[8, 10] = K_local[10, 8] = 6 * E * Iy / (L**2)
-        K_local[4, 4] = K_local[10, 10] = 4 * E * Iy / L
-        K_local[4, 10] = K_local[10, 4] = 2 * E * Iy / L
-        
-        # Transform to global coordinates
-        T = self._get_transformation_matrix(element)
-        K_global = T.T @ K_local @ T
-        
-        element.stiffness_matrix = K_global
-        return K_global
-    
-    def _get_transformation_matrix(self, element: AnalysisElement) -> np.ndarray:
-        """Get transformation matrix from local to global coordinates"""
-        # 3x3 rotation matrix
-        R = element.local_axes
-        
-        # 12x12 transformation matrix for 3D frame element
-        T = np.zeros((12, 12))
-        
-        # Fill transformation matrix with rotation matrices
-        for i in range(4):
-            start_idx = i * 3
-            end_idx = start_idx + 3
-            T[start_idx:end_idx, start_idx:end_idx] = R
+        K_local[:, 2, 2] = K_local[:, 8, 8] = 12 * eIyL3
+        K_local[:, 2, 8] = K_local[:, 8, 2] = -12 * eIyL3
+        K_local[:, 2, 4] = K_local[:, 4, 2] = -6 * eIyL2
+        K_local[:, 2, 10] = K_local[:, 10, 2] = -6 * eIyL2
+        K_local[:, 8, 4] = K_local[:, 4, 8] = 6 * eIyL2
+        K_local[:, 8, 10] = K_local[:, 10, 8] = 6 * eIyL2
+        K_local[:, 4, 4] = K_local[:, 10, 10] = 4 * eIyL
+        K_local[:, 4, 10] = K_local[:, 10, 4] = 2 * eIyL
         
-        return T
+        return K_local
     
-    def assemble_load_vector(self, load_case_id: str) -> np.ndarray:
+    def assemble_load_vector(self, load_case_id: UUID) -> np.ndarray:
         """
         Assemble global load vector for a specific load case
         
         Args:
             load_case_id: ID of the load case
-            
+        
         Returns:
             Global load vector for free DOFs
         """
@@ -351,39 +610,22 @@ class AnalysisEngine:
             logger.warning(f"Load case {load_case_id} not found")
             return F_global
         
-        # Process loads
+        # Nodal loads, scattered onto their free DOFs in one pass
+        dofs = self.dof_index[load_case['load_node_index']]
+        free = dofs >= 0
+        np.add.at(F_global, dofs[free], load_case['load_values'][free])
+        
+        # Process element loads
         for load in load_case['loads']:
             load_type = load.get('type')
             
-            if load_type == 'nodal':
-                self._apply_nodal_load(F_global, load)
-            elif load_type == 'element':
+            if load_type == 'element':
                 self._apply_element_load(F_global, load)
             elif load_type == 'distributed':
                 self._apply_distributed_load(F_global, load)
         
         return F_global
     
-    def _apply_nodal_load(self, F_global: np.ndarray, load: Dict[str, Any]) -> None:
-        """Apply nodal load to global load vector"""
-        node_id = load.get('node_id')
-        forces = load.get('forces', {})
-        
-        node = self.nodes.get(node_id)
-        if not node:
-            logger.warning(f"Node {node_id} not found for nodal load")
-            return
-        
-        # Apply forces to corresponding DOFs
-        dof_names = ['dx', 'dy', 'dz', 'rx', 'ry', 'rz']
-        force_names = ['Fx', 'Fy', 'Fz', 'Mx', 'My', 'Mz']
-        
-        for i, (dof_name, force_name) in enumerate(zip(dof_names, force_names)):
-            if force_name in forces:
-                global_dof = node.dof_indices[i]
-                if global_dof >= 0:  # Free DOF
-                    F_global[global_dof] += forces[force_name]
-    
     def _apply_element_load(self, F_global: np.ndarray, load: Dict[str, Any]) -> None:
         """Apply element load (converted to equivalent nodal loads)"""
         # Simplified implementation - would need more sophisticated load conversion
@@ -394,33 +636,54 @@ class AnalysisEngine:
         # Simplified implementation - would need more sophisticated load conversion
         pass
     
-    def solve_system(self, K: np.ndarray, F: np.ndarray) -> np.ndarray:
+    def factorize(self, K: sp.sparray) -> Solver:
+        """Factor K once; later solves against the same matrix only do triangular solves"""
+        if self._factored_matrix is not K:
+            logger.info("Factorizing stiffness matrix...")
+            
+            try:
+                if not self.mixed_precision and not _same_buffer(getattr(K, 'indices', None), self._symbolic_indices):
+                    self._symbolic = analyze(K)
+                    self._symbolic_indices = K.indices
+                
+                self._solver = factorize(K, mixed_precision=self.mixed_precision, symbolic=self._symbolic)
+            except np.linalg.LinAlgError as e:
+                logger.error(f"Failed to factorize stiffness matrix: {e}")
+                raise
+            
+            self._factored_matrix = K
+        
+        return self._solver
+    
+    def solve_system(self, K: sp.sparray, F: np.ndarray) -> np.ndarray:
         """
         Solve the system of equations K * u = F
         
         Args:
-            K: Global stiffness matrix
-            F: Global load vector
-            
+            K: Sparse global stiffness matrix
+            F: Global load vector, or an (ndof, n_cases) matrix of load vectors
+        
         Returns:
-            Displacement vector
+            Displacement vector (or matrix, matching F)
         """
         logger.info("Solving system of equations...")
         
-        try:
-            # Check for singularity
-            if np.linalg.cond(K) > 1e12:
-                logger.warning("Stiffness matrix is ill-conditioned")
-            
-            # Solve using direct method
-            displacements = np.linalg.solve(K, F)
-            
-            logger.info("System solved successfully")
-            return displacements
+        solve = self.factorize(K)
+        displacements = solve(F)
+        
+        # Cheap accuracy check (one sparse matrix-vector product) instead of a
+        # dense condition number estimate; ill-conditioned systems get one step
+        # of iterative refinement, which reuses the factorization
+        residual = F - K @ displacements
+        if relative_residual(residual, F) > RESIDUAL_TOLERANCE:
+            displacements = displacements + solve(residual)
             
-        except np.linalg.LinAlgError as e:
-            logger.error(f"Failed to solve system: {e}")
-            raise
+            refined_residual = relative_residual(F - K @ displacements, F)
+            if refined_residual > RESIDUAL_TOLERANCE:
+                logger.warning(f"Stiffness matrix is ill-conditioned (relative residual {refined_residual:.2e})")
+        
+        logger.info("System solved successfully")
+        return displacements
     
     def calculate_reactions(self, displacements: np.ndarray) -> np.ndarray:
         """Calculate reaction forces at supports"""
@@ -432,67 +695,38 @@ class AnalysisEngine:
         
         return reactions
     
-    def calculate_element_forces(self, displacements: np.ndarray) -> Dict[str, Dict[str, Any]]:
+    def calculate_node_displacements(self, displacements: np.ndarray) -> np.ndarray:
+        """Gather nodal displacements as an (n_nodes, 6) array in DOF_NAMES order, zero on restrained DOFs"""
+        return np.where(self.dof_index >= 0, displacements[self.dof_index.clip(min=0)], 0.0)
+    
+    def calculate_element_forces(self, displacements: np.ndarray) -> Dict[UUID, Dict[str, Any]]:
         """Calculate internal forces in elements"""
         logger.info("Calculating element forces...")
         
+        # Gather element displacements (n x 12), zero on restrained DOFs
+        element_dofs = self.elem_dofs
+        u_elements = np.where(element_dofs >= 0, displacements[element_dofs.clip(min=0)], 0.0)
+        
+        # Transform to local coordinates (R applied to each 3-DOF block) and
+        # calculate local forces for all elements
+        u_local = np.einsum('nij,nbj->nbi', self.local_axes, u_elements.reshape(-1, 4, 3)).reshape(-1, 12)
+        K_local = self.K_local_all if self.K_local_all is not None else self._calculate_local_stiffness()
+        f_local = np.einsum('nij,nj->ni', K_local, u_local)
+        
+        # Store results
         element_forces = {}
         
-        for element in self.elements.values():
-            # Get element displacements
-            start_dofs = element.start_node.dof_indices
-            end_dofs = element.end_node.dof_indices
-            element_dofs = start_dofs + end_dofs
-            
-            # Extract element displacements
-            u_element = np.zeros(12)
-            for i, global_dof in enumerate(element_dofs):
-                if global_dof >= 0:
-                    u_element[i] = displacements[global_dof]
-            
-            # Transform to local coordinates
-            T = self._get_transformation_matrix(element)
-            u_local = T @ u_element
-            
-            # Calculate local forces
-            K_local = self._calculate_local_stiffness(element)
-            f_local = K_local @ u_local
-            
-            # Store results
-            element_forces[element.id] = {
-                'element_id': element.element_id,
-                'axial': f_local[6] - f_local[0],  # Axial force
-                'shear_y': f_local[7] - f_local[1],  # Shear force Y
-                'shear_z': f_local[8] - f_local[2],  # Shear force Z
-                'torsion': f_local[9] - f_local[3],  # Torsional moment
-                'moment_y': f_local[10],  # Moment about Y
-                'moment_z': f_local[11],  # Moment about Z
-                'local_forces': f_local.tolist(),
-                'local_displacements': u_local.tolist()
+        for element_id, element_number, f, u in zip(self.elem_ids, self.elem_numbers.tolist(), f_local.tolist(), u_local.tolist()):
+            element_forces[element_id] = {
+                'element_id': element_number,
+                'axial': f[6] - f[0],  # Axial force
+                'shear_y': f[7] - f[1],  # Shear force Y
+                'shear_z': f[8] - f[2],  # Shear force Z
+                'torsion': f[9] - f[3],  # Torsional moment
+                'moment_y': f[10],  # Moment about Y
+                'moment_z': f[11],  # Moment about Z
+                'local_forces': f,
+                'local_displacements': u
             }
         
         return element_forces
-    
-    def _calculate_local_stiffness(self, element: AnalysisElement) -> np.ndarray:
-        """Calculate element stiffness matrix in local coordinates"""
-        # Same as in _calculate_element_stiffness but without transformation
-        E = element.material.get('E', 200000.0)
-        G = element.material.get('G', 80000.0)
-        A = element.section.get('A', 1.0)
-        Iy = element.section.get('Iy', 1.0)
-        Iz = element.section.get('Iz', 1.0)
-        J = element.section.get('J', 1.0)
-        L = element.length
-        
-        K_local = np.zeros((12, 12))
-        
-        # Fill local stiffness matrix (same as before)
-        K_local[0, 0] = K_local[6, 6] = E * A / L
-        K_local[0, 6] = K_local[6, 0] = -E * A / L
-        
-        K_local[3, 3] = K_local[9, 9] = G * J / L
-        K_local[3, 9] = K_local[9, 3] = -G * J / L
-        
-        # Continue with other terms...
-        
-        return K_local
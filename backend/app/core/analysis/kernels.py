@@ -0,0 +1,154 @@
+"""
+Compiled element kernels for structural analysis
+
+Scalar per-element arithmetic is compiled with Numba when it is installed.
+Numba is optional: without it NUMBA_AVAILABLE is False and the analysis
+engine uses its vectorized NumPy implementation instead.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True, fastmath=True)
+def build_frame_ke(EA, GJ, EIy, EIz, L, out_K):
+    """
+    Write the local 12x12 stiffness matrix of a 3D frame element into out_K
+    
+    The section rigidities are precomputed per material/section pair, so
+    only the length varies between elements of the same group.
+    """
+    out_K[:, :] = 0.0
+    
+    # Shared stiffness coefficients, computed once (divisions instead of pow)
+    eAL = EA / L
+    gJL = GJ / L
+    eIzL = EIz / L
+    eIzL2 = eIzL / L
+    eIzL3 = eIzL2 / L
+    eIyL = EIy / L
+    eIyL2 = eIyL / L
+    eIyL3 = eIyL2 / L
+    
+    # Axial terms
+    out_K[0, 0] = out_K[6, 6] = eAL
+    out_K[0, 6] = out_K[6, 0] = -eAL
+    
+    # Torsional terms
+    out_K[3, 3] = out_K[9, 9] = gJL
+    out_K[3, 9] = out_K[9, 3] = -gJL
+    
+    # Bending terms (Y-axis)
+    out_K[1, 1] = out_K[7, 7] = 12 * eIzL3
+    out_K[1, 7] = out_K[7, 1] = -12 * eIzL3
+    out_K[1, 5] = out_K[5, 1] = 6 * eIzL2
+    out_K[1, 11] = out_K[11, 1] = 6 * eIzL2
+    out_K[7, 5] = out_K[5, 7] = -6 * eIzL2
+    out_K[7, 11] = out_K[11, 7] = -6 * eIzL2
+    out_K[5, 5] = out_K[11, 11] = 4 * eIzL
+    out_K[5, 11] = out_K[11, 5] = 2 * eIzL
+    
+    # Bending terms (Z-axis)
+    out_K[2, 2] = out_K[8, 8] = 12 * eIyL3
+    out_K[2, 8] = out_K[8, 2] = -12 * eIyL3
+    out_K[2, 4] = out_K[4, 2] = -6 * eIyL2
+    out_K[2, 10] = out_K[10, 2] = -6 * eIyL2
+    out_K[8, 4] = out_K[4, 8] = 6 * eIyL2
+    out_K[8, 10] = out_K[10, 8] = 6 * eIyL2
+    out_K[4, 4] = out_K[10, 10] = 4 * eIyL
+    out_K[4, 10] = out_K[10, 4] = 2 * eIyL
+
+@njit(cache=True, fastmath=True)
+def build_frame_kg(axial, L, out_K):
+    """
+    Write the simplified 12x12 geometric stiffness matrix of a frame element into out_K
+    
+    Only the transverse translation terms are nonzero; negligible axial
+    forces give a zero matrix.
+    """
+    out_K[:, :] = 0.0
+    
+    if abs(axial) <= 1e-6:
+        return
+    
+    factor = 1.2 * axial / L
+    
+    out_K[1, 1] = out_K[7, 7] = factor
+    out_K[1, 7] = out_K[7, 1] = -factor
+    out_K[2, 2] = out_K[8, 8] = factor
+    out_K[2, 8] = out_K[8, 2] = -factor
+
+@njit(cache=True, fastmath=True)
+def transform_12x12(R, K, out):
+    """
+    Write T^T K T into out, where T is block-diagonal with four copies of R
+    
+    Each of the sixteen 3x3 blocks is rotated as R^T (K_ab R), two 3x3
+    products per block, so the 12x12 transformation matrix is never formed.
+    """
+    KR = np.empty((3, 3))
+    
+    for a in range(4):
+        for b in range(4):
+            # KR = K_ab R
+            for k in range(3):
+                for j in range(3):
+                    KR[k, j] = (
+                        K[3 * a + k, 3 * b] * R[0, j]
+                        + K[3 * a + k, 3 * b + 1] * R[1, j]
+                        + K[3 * a + k, 3 * b + 2] * R[2, j]
+                    )
+            
+            # out_ab = R^T KR
+            for i in range(3):
+                for j in range(3):
+                    out[3 * a + i, 3 * b + j] = R[0, i] * KR[0, j] + R[1, i] * KR[1, j] + R[2, i] * KR[2, j]
+
+@njit(cache=True, fastmath=True, parallel=True, nogil=True)
+def assemble_local_k_all(group_constants, elem_group, L, R, out_local, out):
+    """
+    Write the local and global-coordinate stiffness matrices of all elements into out_local and out (n x 12 x 12)
+    
+    group_constants holds (EA, GJ, EIy, EIz) per group and elem_group maps
+    each element to its group.
+    """
+    for e in prange(L.shape[0]):
+        C = group_constants[elem_group[e]]
+        build_frame_ke(C[0], C[1], C[2], C[3], L[e], out_local[e])
+        transform_12x12(R[e], out_local[e], out[e])
+
+@njit(cache=True, fastmath=True, parallel=True, nogil=True)
+def assemble_geometric_k_all(axial, L, R, out):
+    """Write the global-coordinate geometric stiffness matrices of all elements into out (n x 12 x 12)"""
+    for e in prange(L.shape[0]):
+        K_local = np.empty((12, 12))
+        build_frame_kg(axial[e], L[e], K_local)
+        transform_12x12(R[e], K_local, out[e])
+
+@njit(cache=True, parallel=True, nogil=True)
+def scatter_triplets(element_dofs, element_matrices, rows, cols, data):
+    """
+    Write the COO triplets of all element matrices into rows, cols and data
+    
+    Element e owns the 144 slots starting at e * 144, so elements are
+    scattered in parallel without write conflicts.
+    """
+    for e in prange(element_dofs.shape[0]):
+        base = e * 144
+        for i in range(12):
+            for j in range(12):
+                k = base + i * 12 + j
+                rows[k] = element_dofs[e, i]
+                cols[k] = element_dofs[e, j]
+                data[k] = element_matrices[e, i, j]
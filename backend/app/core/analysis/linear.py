@@ -3,11 +3,12 @@ Linear structural analysis implementation
 """
 
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from uuid import UUID
 import time
 import logging
 
-from app.core.analysis.engine import AnalysisEngine
+from app.core.analysis.engine import DOF_NAMES, AnalysisEngine, AnalysisCancelled, CancelCheck, raise_if_cancelled
 from app.schemas.analysis import AnalysisSettings
 
 logger = logging.getLogger(__name__)
@@ -28,13 +29,19 @@ class LinearAnalysis:
         self.engine = engine
         self.results: Dict[str, Any] = {}
         
-    async def run(self, load_case_ids: List[str], settings: AnalysisSettings) -> Dict[str, Any]:
+    async def run(
+        self,
+        load_case_ids: List[UUID],
+        settings: AnalysisSettings,
+        is_cancelled: Optional[CancelCheck] = None
+    ) -> Dict[str, Any]:
         """
         Run linear analysis for specified load cases
         
         Args:
             load_case_ids: List of load case IDs to analyze
             settings: Analysis settings
+            is_cancelled: Optional cancellation check, polled between load cases
             
         Returns:
             Dictionary containing analysis results for each load case
@@ -49,17 +56,25 @@ class LinearAnalysis:
             # Assemble global stiffness matrix
             K_global = self.engine.assemble_global_stiffness()
             
-            # Analyze each load case
+            # Assemble load vectors as columns of one (ndof, n_cases) matrix
+            F_all = np.column_stack([
+                self.engine.assemble_load_vector(load_case_id)
+                for load_case_id in load_case_ids
+            ])
+            
+            # K is factored once and all load cases are solved together
+            await raise_if_cancelled(is_cancelled)
+            self.engine.mixed_precision = settings.mixed_precision
+            U_all = self.engine.solve_system(K_global, F_all)
+            
+            # Process each load case
             results = {}
             
-            for load_case_id in load_case_ids:
-                logger.info(f"Analyzing load case: {load_case_id}")
-                
-                # Assemble load vector
-                F_global = self.engine.assemble_load_vector(load_case_id)
+            for case_index, load_case_id in enumerate(load_case_ids):
+                await raise_if_cancelled(is_cancelled)
+                logger.info(f"Processing results for load case: {load_case_id}")
                 
-                # Solve system
-                displacements = self.engine.solve_system(K_global, F_global)
+                displacements = U_all[:, case_index]
                 
                 # Calculate reactions
                 reactions = self.engine.calculate_reactions(displacements)
@@ -87,49 +102,36 @@ class LinearAnalysis:
             
             return results
             
+        except AnalysisCancelled:
+            logger.info("Linear analysis cancelled")
+            raise
         except Exception as e:
             logger.error(f"Linear analysis failed: {e}")
             raise
     
     def _process_node_results(self, displacements: np.ndarray, reactions: np.ndarray) -> Dict[str, Any]:
         """Process node results into structured format"""
-        node_results = {}
+        # One gather for all nodes; only the final dict build is per node
+        node_displacements = self.engine.calculate_node_displacements(displacements)
         
-        for node in self.engine.nodes.values():
-            # Extract displacements
-            node_displacements = {}
-            node_reactions = {}
-            
-            dof_names = ['dx', 'dy', 'dz', 'rx', 'ry', 'rz']
-            
-            for i, dof_name in enumerate(dof_names):
-                global_dof = node.dof_indices[i]
-                
-                if global_dof >= 0:
-                    # Free DOF - has displacement
-                    node_displacements[dof_name] = float(displacements[global_dof])
-                    node_reactions[dof_name] = 0.0
-                else:
-                    # Restrained DOF - has reaction
-                    node_displacements[dof_name] = 0.0
-                    # Would need to calculate actual reaction force
-                    node_reactions[dof_name] = 0.0
-            
-            node_results[str(node.node_id)] = {
-                'displacements': node_displacements,
-                'reactions': node_reactions
-            }
+        # Would need to calculate actual reaction forces at restrained DOFs
+        node_reactions = dict.fromkeys(DOF_NAMES, 0.0)
         
-        return node_results
+        return {
+            str(node_number): {
+                'displacements': dict(zip(DOF_NAMES, values)),
+                'reactions': dict(node_reactions)
+            }
+            for node_number, values in zip(self.engine.node_numbers.tolist(), node_displacements.tolist())
+        }
     
-    def _process_element_results(self, element_forces: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    def _process_element_results(self, element_forces: Dict[UUID, Dict[str, Any]]) -> Dict[str, Any]:
         """Process element results into structured format"""
         element_results = {}
         
-        for element_id, forces in element_forces.items():
-            element = self.engine.elements[element_id]
-            
-            element_results[str(element.element_id)] = {
+        # Rows of element_forces follow the engine's element order
+        for forces, section in zip(element_forces.values(), self.engine.element_sections()):
+            element_results[str(forces['element_id'])] = {
                 'forces': {
                     'axial': forces['axial'],
                     'shear_y': forces['shear_y'],
@@ -138,18 +140,18 @@ class LinearAnalysis:
                     'moment_y': forces['moment_y'],
                     'moment_z': forces['moment_z']
                 },
-                'stresses': self._calculate_stresses(element, forces),
+                'stresses': self._calculate_stresses(section, forces),
                 'strains': {}  # Would calculate if needed
             }
         
         return element_results
     
-    def _calculate_stresses(self, element, forces: Dict[str, Any]) -> Dict[str, float]:
+    def _calculate_stresses(self, section: Dict[str, Any], forces: Dict[str, Any]) -> Dict[str, float]:
         """Calculate element stresses from forces"""
         # Simplified stress calculation
-        A = element.section.get('A', 1.0)
-        Sy = element.section.get('Sy', 1.0)
-        Sz = element.section.get('Sz', 1.0)
+        A = section.get('A', 1.0)
+        Sy = section.get('Sy', 1.0)
+        Sz = section.get('Sz', 1.0)
         
         stresses = {
             'axial': forces['axial'] / A if A > 0 else 0.0,
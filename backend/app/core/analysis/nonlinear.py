@@ -3,15 +3,33 @@ Nonlinear structural analysis implementation
 """
 
 import numpy as np
-from typing import Dict, List, Any
+import scipy.sparse as sp
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from uuid import UUID
 import time
 import logging
 
-from app.core.analysis.engine import AnalysisEngine
+from app.core.analysis.engine import DOF_NAMES, AnalysisEngine, AnalysisCancelled, CancelCheck, raise_if_cancelled
+from app.core.analysis.kernels import NUMBA_AVAILABLE, assemble_geometric_k_all
+from app.core.analysis.solvers import Solver, factorize_float32
 from app.schemas.analysis import AnalysisSettings
 
 logger = logging.getLogger(__name__)
 
+# Modified Newton: the factored tangent is kept while each iteration cuts the
+# residual norm by at least this ratio, for at most MAX_TANGENT_AGE iterations
+FAST_CONVERGENCE_RATIO = 0.25
+MAX_TANGENT_AGE = 3
+
+# Smallest step length the line search may return
+MIN_STEP_LENGTH = 0.1
+
+# Tangent stiffness as a function of the current displacements
+TangentFunction = Callable[[np.ndarray], sp.csr_array]
+
+# Global internal force vector as a function of the current displacements
+InternalForceFunction = Callable[[np.ndarray], np.ndarray]
+
 class NonlinearAnalysis:
     """
     Nonlinear structural analysis implementation
@@ -28,13 +46,23 @@ class NonlinearAnalysis:
         self.engine = engine
         self.results: Dict[str, Any] = {}
         
-    async def run(self, load_case_ids: List[str], settings: AnalysisSettings) -> Dict[str, Any]:
+        # float32 factorization of the last tangent (mixed-precision Newton)
+        self._tangent: Optional[sp.csr_array] = None
+        self._tangent_solve: Optional[Solver] = None
+        
+    async def run(
+        self,
+        load_case_ids: List[UUID],
+        settings: AnalysisSettings,
+        is_cancelled: Optional[CancelCheck] = None
+    ) -> Dict[str, Any]:
         """
         Run nonlinear analysis for specified load cases
         
         Args:
             load_case_ids: List of load case IDs to analyze
             settings: Analysis settings
+            is_cancelled: Optional cancellation check, polled between load cases and load steps
             
         Returns:
             Dictionary containing analysis results for each load case
@@ -46,14 +74,31 @@ class NonlinearAnalysis:
             # Prepare model
             self.engine.prepare_model()
             
+            self.engine.mixed_precision = settings.mixed_precision
+            
+            # The linear stiffness does not change between load cases; only the
+            # geometric contribution is reassembled per Newton iteration
+            K_linear = self.engine.assemble_global_stiffness()
+            
+            # Linear solutions for all load cases from one factorization and one
+            # batched solve; they serve as load step predictors below
+            F_all = np.zeros((self.engine.total_dofs, len(load_case_ids)))
+            for j, load_case_id in enumerate(load_case_ids):
+                F_all[:, j] = self.engine.assemble_load_vector(load_case_id)
+            
+            u_linear_all = self.engine.solve_system(K_linear, F_all) if load_case_ids else F_all
+            
             # Analyze each load case
             results = {}
             
-            for load_case_id in load_case_ids:
+            for j, load_case_id in enumerate(load_case_ids):
+                await raise_if_cancelled(is_cancelled)
                 logger.info(f"Analyzing load case: {load_case_id}")
                 
                 # Run nonlinear solution
-                case_result = await self._solve_nonlinear_case(load_case_id, settings)
+                case_result = await self._solve_nonlinear_case(
+                    F_all[:, j], u_linear_all[:, j], K_linear, settings, is_cancelled
+                )
                 results[load_case_id] = case_result
             
             total_time = time.time() - start_time
@@ -61,19 +106,43 @@ class NonlinearAnalysis:
             
             return results
             
+        except AnalysisCancelled:
+            logger.info("Nonlinear analysis cancelled")
+            raise
         except Exception as e:
             logger.error(f"Nonlinear analysis failed: {e}")
             raise
     
-    async def _solve_nonlinear_case(self, load_case_id: str, settings: AnalysisSettings) -> Dict[str, Any]:
-        """Solve a single nonlinear load case using Newton-Raphson method"""
+    async def _solve_nonlinear_case(
+        self,
+        F_total: np.ndarray,
+        u_linear: np.ndarray,
+        K_linear: sp.csr_array,
+        settings: AnalysisSettings,
+        is_cancelled: Optional[CancelCheck] = None
+    ) -> Dict[str, Any]:
+        """
+        Solve a single nonlinear load case using Newton-Raphson method
+        
+        Args:
+            F_total: Total load vector of the load case
+            u_linear: Linear solution K_linear^-1 F_total, used as load step predictor
+            K_linear: Linear global stiffness matrix
+            settings: Analysis settings
+            is_cancelled: Optional cancellation check, polled between load steps
+        """
         
         # Initialize
         max_iterations = settings.max_iterations
         tolerance = settings.convergence_tolerance
         
-        # Get total load vector
-        F_total = self.engine.assemble_load_vector(load_case_id)
+        # Convergence is tested on the squared residual norm (a single dot
+        # product); the square root is only taken for reporting
+        tolerance2 = tolerance * tolerance
+        fast_convergence_ratio2 = FAST_CONVERGENCE_RATIO * FAST_CONVERGENCE_RATIO
+        
+        tangent = self._make_tangent(settings, K_linear)
+        internal_forces = self._make_internal_forces(settings, K_linear)
         
         # Initialize displacement vector
         u = np.zeros(self.engine.total_dofs)
@@ -89,10 +158,18 @@ class NonlinearAnalysis:
             'load_steps': []
         }
         
+        # Load and residual buffers, reused by every load step and iteration
+        F_current = np.empty_like(F_total)
+        residual = np.empty_like(F_total)
+        
         # Load stepping loop
         for step in range(num_steps):
+            await raise_if_cancelled(is_cancelled)
             current_load_factor = (step + 1) * load_increment
-            F_current = F_total * current_load_factor
+            np.multiply(F_total, current_load_factor, out=F_current)
+            
+            # Initial-stiffness predictor for the load increment
+            u += load_increment * u_linear
             
             logger.info(f"Load step {step + 1}/{num_steps} (factor: {current_load_factor:.2f})")
             
@@ -100,38 +177,52 @@ class NonlinearAnalysis:
             step_converged = False
             step_iterations = 0
             
+            # Calculate residual forces
+            F_internal = internal_forces(u)
+            np.subtract(F_current, F_internal, out=residual)
+            residual_norm2 = residual @ residual
+            
+            K_tangent = None
+            tangent_age = 0
+            previous_residual_norm2 = float('inf')
+            
             for iteration in range(max_iterations):
                 step_iterations += 1
                 
-                # Assemble tangent stiffness matrix
-                K_tangent = self._assemble_tangent_stiffness(u, settings)
-                
-                # Calculate residual forces
-                F_internal = self._calculate_internal_forces(u)
-                residual = F_current - F_internal
-                
                 # Check convergence
-                residual_norm = np.linalg.norm(residual)
-                
-                if residual_norm < tolerance:
+                if residual_norm2 < tolerance2:
                     step_converged = True
                     logger.info(f"Step {step + 1} converged in {step_iterations} iterations")
                     break
                 
+                # Reassemble the tangent only when convergence slows down; otherwise
+                # the factorization of the current one is reused
+                if (
+                    K_tangent is None
+                    or tangent_age >= MAX_TANGENT_AGE
+                    or residual_norm2 >= fast_convergence_ratio2 * previous_residual_norm2
+                ):
+                    K_tangent = tangent(u)
+                    tangent_age = 0
+                tangent_age += 1
+                
                 # Solve for displacement increment
                 try:
-                    du = np.linalg.solve(K_tangent, residual)
-                    u += du
+                    du = self._solve_tangent(K_tangent, residual, settings)
                 except np.linalg.LinAlgError:
                     logger.error(f"Singular tangent stiffness matrix at step {step + 1}")
                     break
+                
+                alpha, new_residual_norm2 = self._line_search(u, du, F_current, residual_norm2, internal_forces, residual)
+                u += alpha * du
+                previous_residual_norm2, residual_norm2 = residual_norm2, new_residual_norm2
             
             convergence_info['load_steps'].append({
                 'step': step + 1,
                 'load_factor': current_load_factor,
                 'converged': step_converged,
                 'iterations': step_iterations,
-                'residual': float(residual_norm) if 'residual_norm' in locals() else float('inf')
+                'residual': float(np.sqrt(residual_norm2))
             })
             
             if not step_converged:
@@ -158,140 +249,215 @@ class NonlinearAnalysis:
             'convergence_info': convergence_info
         }
     
-    def _assemble_tangent_stiffness(self, displacements: np.ndarray, settings: AnalysisSettings) -> np.ndarray:
-        """Assemble tangent stiffness matrix including nonlinear effects"""
+    def _solve_tangent(self, K_tangent: sp.csr_array, residual: np.ndarray, settings: AnalysisSettings) -> np.ndarray:
+        """
+        Solve K_tangent du = residual for the Newton step
         
-        # Start with linear stiffness
-        K_tangent = self.engine.assemble_global_stiffness()
+        The factorization of the current tangent is reused until the tangent
+        is reassembled. The step is not refined (with mixed precision the
+        tangent is even factored in float32); the float64 residual check of
+        the Newton loop keeps the converged solution accurate.
+        """
+        if not settings.mixed_precision:
+            return self.engine.factorize(K_tangent)(residual)
         
-        # Add geometric stiffness (P-Delta effects)
-        if settings.include_geometric_nonlinearity or settings.include_pdelta:
-            K_geometric = self._assemble_geometric_stiffness(displacements)
-            K_tangent += K_geometric
+        if self._tangent is not K_tangent:
+            self._tangent_solve = factorize_float32(K_tangent)
+            self._tangent = K_tangent
+        
+        return self._tangent_solve(residual)
+    
+    def _line_search(
+        self,
+        u: np.ndarray,
+        du: np.ndarray,
+        F_current: np.ndarray,
+        residual_norm2: float,
+        internal_forces: InternalForceFunction,
+        residual: np.ndarray
+    ) -> Tuple[float, float]:
+        """
+        Choose the step length alpha for the update u + alpha * du
+        
+        The full step is taken when it reduces the residual. Otherwise alpha
+        minimizes a parabola fitted to ||r||^2 at alpha = 0, 1/2 and 1.
+        The residual at the new displacements is written into residual.
+        
+        Returns:
+            Step length and the squared norm of the new residual
+        """
+        np.subtract(F_current, internal_forces(u + du), out=residual)
+        g1 = residual @ residual
+        
+        if g1 < residual_norm2:
+            return 1.0, g1
+        
+        np.subtract(F_current, internal_forces(u + 0.5 * du), out=residual)
+        g0 = residual_norm2
+        g_half = residual @ residual
+        
+        # g(alpha) = g0 + b alpha + c alpha^2 through the three samples
+        c = 2.0 * (g1 - 2.0 * g_half + g0)
+        b = g1 - g0 - c
+        alpha = float(np.clip(-b / (2.0 * c), MIN_STEP_LENGTH, 1.0)) if c > 0 else 0.5
+        
+        np.subtract(F_current, internal_forces(u + alpha * du), out=residual)
+        return alpha, residual @ residual
+    
+    def _make_tangent(self, settings: AnalysisSettings, K_linear: sp.csr_array) -> TangentFunction:
+        """
+        Build the tangent stiffness function u -> K_tangent for the analysis settings
         
-        # Add material nonlinearity effects
+        The nonlinearity flags are fixed for a load case, so they are resolved
+        once here instead of on every Newton iteration.
+        """
         if settings.include_material_nonlinearity:
-            K_material = self._assemble_material_stiffness(displacements)
-            K_tangent = K_material  # Replace with updated material stiffness
+            # Updated material stiffness replaces the whole tangent
+            return lambda displacements: self._assemble_material_stiffness(displacements, K_linear)
+        
+        if settings.include_geometric_nonlinearity or settings.include_pdelta:
+            # Geometric stiffness (P-Delta effects) is assembled on the pattern of
+            # K_linear, so the tangent keeps the same sparsity pattern every
+            # iteration and the sum is a plain data add
+            def geometric_tangent(displacements: np.ndarray) -> sp.csr_array:
+                K_geometric = self._assemble_geometric_stiffness(displacements, K_linear)
+                return sp.csr_array((K_linear.data + K_geometric.data, K_linear.indices, K_linear.indptr), shape=K_linear.shape)
+            
+            return geometric_tangent
         
-        return K_tangent
+        # Linear stiffness (not modified in place)
+        return lambda displacements: K_linear
     
-    def _assemble_geometric_stiffness(self, displacements: np.ndarray) -> np.ndarray:
+    def _assemble_geometric_stiffness(self, displacements: np.ndarray, K_linear: sp.csr_array) -> sp.csr_array:
         """Assemble geometric stiffness matrix for P-Delta effects"""
         
-        K_geometric = np.zeros((self.engine.total_dofs, self.engine.total_dofs))
-        
         # This is a simplified implementation
         # Production code would have detailed geometric stiffness calculation
         
-        for element in self.engine.elements.values():
-            # Calculate axial force in element
-            element_forces = self._calculate_element_axial_force(element, displacements)
-            axial_force = element_forces.get('axial', 0.0)
-            
-            # Calculate geometric stiffness matrix for element
-            K_g_element = self._calculate_element_geometric_stiffness(element, axial_force)
-            
-            # Assemble into global matrix
-            start_dofs = element.start_node.dof_indices
-            end_dofs = element.end_node.dof_indices
-            element_dofs = start_dofs + end_dofs
-            
-            for i, global_i in enumerate(element_dofs):
-                if global_i >= 0:
-                    for j, global_j in enumerate(element_dofs):
-                        if global_j >= 0:
-                            K_geometric[global_i, global_j] += K_g_element[i, j]
+        # Calculate axial force in all elements
+        axial_forces = self._calculate_axial_forces(displacements)
         
-        return K_geometric
+        # Calculate geometric stiffness matrices for all elements, in global coordinates
+        K_g_elements = self._calculate_geometric_stiffness(self.engine.elem_L, axial_forces)
+        
+        return self.engine.assemble_sparse(K_g_elements, pattern=K_linear)
     
-    def _calculate_element_axial_force(self, element, displacements: np.ndarray) -> Dict[str, float]:
-        """Calculate current axial force in element"""
-        # Simplified calculation
-        return {'axial': 0.0}
+    def _calculate_axial_forces(self, displacements: np.ndarray) -> np.ndarray:
+        """Calculate current axial force in all elements (n_elements,), tension positive"""
+        engine = self.engine
+        
+        # Element end displacements (n x 12), zero on restrained DOFs
+        element_dofs = engine.elem_dofs
+        u_elements = np.where(element_dofs >= 0, displacements[element_dofs.clip(min=0)], 0.0)
+        
+        # Elongation: local x component of the relative end translation, using
+        # the same rotation as element force recovery (u_local = R u)
+        elongation = np.einsum('ni,ni->n', engine.local_axes[:, 0, :], u_elements[:, 6:9] - u_elements[:, 0:3])
+        EA = engine.group_constants[engine.elem_group, 0]
+        
+        return EA / engine.elem_L * elongation
     
-    def _calculate_element_geometric_stiffness(self, element, axial_force: float) -> np.ndarray:
-        """Calculate element geometric stiffness matrix"""
-        # Simplified geometric stiffness for beam element
-        L = element.length
-        K_g = np.zeros((12, 12))
-        
-        if abs(axial_force) > 1e-6:
-            # Simplified geometric stiffness terms
-            factor = axial_force / L
-            
-            # Transverse displacement terms
-            K_g[1, 1] = K_g[7, 7] = factor * 1.2
-            K_g[1, 7] = K_g[7, 1] = -factor * 1.2
-            K_g[2, 2] = K_g[8, 8] = factor * 1.2
-            K_g[2, 8] = K_g[8, 2] = -factor * 1.2
+    def _calculate_geometric_stiffness(self, L: np.ndarray, axial_forces: np.ndarray) -> np.ndarray:
+        """Calculate element geometric stiffness matrices in global coordinates (n_elements x 12 x 12)"""
+        # Simplified geometric stiffness for beam elements
+        if NUMBA_AVAILABLE:
+            K_g = np.empty((len(L), 12, 12))
+            assemble_geometric_k_all(axial_forces, L, self.engine.local_axes, K_g)
+            return K_g
         
-        return K_g
+        K_g = np.zeros((len(L), 12, 12))
+        
+        # Simplified geometric stiffness terms, zero for negligible axial force
+        factor = np.where(np.abs(axial_forces) > 1e-6, axial_forces / L, 0.0) * 1.2
+        
+        # Transverse displacement terms
+        K_g[:, 1, 1] = K_g[:, 7, 7] = factor
+        K_g[:, 1, 7] = K_g[:, 7, 1] = -factor
+        K_g[:, 2, 2] = K_g[:, 8, 8] = factor
+        K_g[:, 2, 8] = K_g[:, 8, 2] = -factor
+        
+        return self.engine.rotate_to_global(K_g)
     
-    def _assemble_material_stiffness(self, displacements: np.ndarray) -> np.ndarray:
+    def _assemble_material_stiffness(self, displacements: np.ndarray, K_linear: sp.csr_array) -> sp.csr_array:
         """Assemble material stiffness matrix with nonlinear material behavior"""
         # This would implement material nonlinearity
         # For now, return linear stiffness
-        return self.engine.assemble_global_stiffness()
+        return K_linear
     
-    def _calculate_internal_forces(self, displacements: np.ndarray) -> np.ndarray:
-        """Calculate internal force vector"""
-        # This would calculate internal forces considering nonlinear effects
-        # For now, use linear relationship
-        K = self.engine.assemble_global_stiffness()
-        return K @ displacements
+    def _make_internal_forces(self, settings: AnalysisSettings, K_linear: sp.csr_array) -> InternalForceFunction:
+        """
+        Build the internal force function u -> F_internal for the analysis settings
+        
+        Without material nonlinearity the internal forces are one sparse
+        product with the stiffness assembled once per analysis.
+        """
+        if settings.include_material_nonlinearity:
+            return self._calculate_element_internal_forces
+        
+        return lambda displacements: K_linear @ displacements
+    
+    def _calculate_element_internal_forces(self, displacements: np.ndarray) -> np.ndarray:
+        """
+        Sum the element end forces of all elements into the global internal force vector
+        
+        Works element by element on the engine arrays, so a nonlinear section
+        law can replace the local force calculation without a global matrix.
+        """
+        engine = self.engine
+        
+        # Element end displacements in local coordinates (n x 12)
+        element_dofs = engine.elem_dofs
+        u_elements = np.where(element_dofs >= 0, displacements[element_dofs.clip(min=0)], 0.0)
+        u_local = np.einsum('nij,nbj->nbi', engine.local_axes, u_elements.reshape(-1, 4, 3)).reshape(-1, 12)
+        
+        # This would evaluate the nonlinear material response; for now the
+        # linear local stiffness from the last assembly is used
+        f_local = np.einsum('nij,nj->ni', engine.K_local_all, u_local)
+        
+        # Back to global coordinates (R^T per 3-DOF block), scattered onto the free DOFs
+        f_global = np.einsum('nji,nbj->nbi', engine.local_axes, f_local.reshape(-1, 4, 3)).reshape(-1, 12)
+        free = element_dofs >= 0
+        return np.bincount(element_dofs[free], weights=f_global[free], minlength=engine.total_dofs)
     
     def _process_node_results(self, displacements: np.ndarray, reactions: np.ndarray) -> Dict[str, Any]:
         """Process node results into structured format"""
         # Same as linear analysis
-        node_results = {}
+        # One gather for all nodes; only the final dict build is per node
+        node_displacements = self.engine.calculate_node_displacements(displacements)
         
-        for node in self.engine.nodes.values():
-            node_displacements = {}
-            node_reactions = {}
-            
-            dof_names = ['dx', 'dy', 'dz', 'rx', 'ry', 'rz']
-            
-            for i, dof_name in enumerate(dof_names):
-                global_dof = node.dof_indices[i]
-                
-                if global_dof >= 0:
-                    node_displacements[dof_name] = float(displacements[global_dof])
-                    node_reactions[dof_name] = 0.0
-                else:
-                    node_displacements[dof_name] = 0.0
-                    node_reactions[dof_name] = 0.0
-            
-            node_results[str(node.node_id)] = {
-                'displacements': node_displacements,
-                'reactions': node_reactions
-            }
+        # Would need to calculate actual reaction forces at restrained DOFs
+        node_reactions = dict.fromkeys(DOF_NAMES, 0.0)
         
-        return node_results
+        return {
+            str(node_number): {
+                'displacements': dict(zip(DOF_NAMES, values)),
+                'reactions': dict(node_reactions)
+            }
+            for node_number, values in zip(self.engine.node_numbers.tolist(), node_displacements.tolist())
+        }
     
-    def _process_element_results(self, element_forces: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    def _process_element_results(self, element_forces: Dict[UUID, Dict[str, Any]]) -> Dict[str, Any]:
         """Process element results into structured format"""
         # Same as linear analysis but could include nonlinear stress-strain relationships
         element_results = {}
         
-        for element_id, forces in element_forces.items():
-            element = self.engine.elements[element_id]
-            
-            element_results[str(element.element_id)] = {
+        # Rows of element_forces follow the engine's element order
+        for forces, section in zip(element_forces.values(), self.engine.element_sections()):
+            element_results[str(forces['element_id'])] = {
                 'forces': forces,
-                'stresses': self._calculate_nonlinear_stresses(element, forces),
+                'stresses': self._calculate_nonlinear_stresses(section, forces),
                 'strains': {}
             }
         
         return element_results
     
-    def _calculate_nonlinear_stresses(self, element, forces: Dict[str, Any]) -> Dict[str, float]:
+    def _calculate_nonlinear_stresses(self, section: Dict[str, Any], forces: Dict[str, Any]) -> Dict[str, float]:
         """Calculate element stresses considering nonlinear material behavior"""
         # For now, use linear stress calculation
         # Production code would implement nonlinear stress-strain relationships
-        A = element.section.get('A', 1.0)
-        Sy = element.section.get('Sy', 1.0)
-        Sz = element.section.get('Sz', 1.0)
+        A = section.get('A', 1.0)
+        Sy = section.get('Sy', 1.0)
+        Sz = section.get('Sz', 1.0)
         
         stresses = {
             'axial': forces.get('axial', 0.0) / A if A > 0 else 0.0,
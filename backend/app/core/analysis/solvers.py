@@ -0,0 +1,254 @@
+"""
+Sparse direct solvers for the global stiffness system
+
+Stiffness matrices are factored once and the factorization is reused for
+every right-hand side. The fastest installed backend is used: Intel MKL
+PARDISO (pypardiso), then SuiteSparse CHOLMOD (scikit-sparse) for the
+symmetric positive definite case, then SuiteSparse UMFPACK (scikit-umfpack),
+then SciPy's SuperLU. PARDISO, like CHOLMOD, first tries a Cholesky
+factorization of the upper triangle and only falls back to LU when the
+matrix is not positive definite, e.g. a tangent stiffness past buckling.
+With SuperLU and a CUDA device available through CuPy, the triangular
+solves for many load cases at once run on the GPU.
+
+Optionally, SuperLU factors a float32 copy of the matrix, halving the
+memory traffic of the triangular solves, and float64 iterative refinement
+recovers full accuracy. Newton iterations, which check the float64 residual
+themselves, can use the float32 factorization without refinement.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu, SuperLU
+from typing import Any, Callable, Optional
+import logging
+
+try:
+    from pypardiso import PyPardisoSolver
+    from pypardiso.pardiso_wrapper import PyPardisoError
+    PARDISO_AVAILABLE = True
+except ImportError:
+    PARDISO_AVAILABLE = False
+
+try:
+    from sksparse.cholmod import analyze as cholmod_analyze, cholesky as cholmod_cholesky, CholmodError
+    CHOLMOD_AVAILABLE = True
+except ImportError:
+    CHOLMOD_AVAILABLE = False
+
+try:
+    from scikits.umfpack import splu as umfpack_splu
+    UMFPACK_AVAILABLE = True
+except ImportError:
+    UMFPACK_AVAILABLE = False
+
+try:
+    import cupy
+    from cupyx.scipy.sparse import csr_matrix as gpu_csr_matrix
+    from cupyx.scipy.sparse.linalg import spsolve_triangular as gpu_spsolve_triangular
+    GPU_AVAILABLE = cupy.cuda.is_available()
+except ImportError:
+    GPU_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Minimum number of simultaneous load cases before triangular solves are
+# offloaded to the GPU; below this the host-device transfers dominate
+GPU_MIN_LOAD_CASES = 32
+
+# Relative residual ||F - K u|| / ||F|| an accurate solve must reach
+RESIDUAL_TOLERANCE = 1e-8
+
+# Refinement steps before a float32 factorization is abandoned for float64
+MAX_REFINEMENT_STEPS = 5
+
+# PARDISO matrix types: real symmetric positive definite, real nonsymmetric
+PARDISO_SPD = 2
+PARDISO_NONSYMMETRIC = 11
+
+# Solves K u = F for a load vector (n,) or a stack of load vectors (n, k)
+Solver = Callable[[np.ndarray], np.ndarray]
+
+def relative_residual(residual: np.ndarray, F: np.ndarray) -> float:
+    """Largest ||r|| / ||F|| over the load vectors (columns) of F"""
+    F_norm = np.linalg.norm(F, axis=0)
+    return float(np.max(np.linalg.norm(residual, axis=0) / np.where(F_norm > 0, F_norm, 1.0), initial=0.0))
+
+def analyze(K: sp.sparray) -> Optional[Any]:
+    """
+    Symbolic analysis (fill-reducing ordering) of the sparsity pattern of K
+    
+    The result can be passed to factorize() for any matrix with the same
+    pattern. Only CHOLMOD exposes a reusable analysis; for the other backends
+    this returns None and every factorization orders from scratch.
+    """
+    if PARDISO_AVAILABLE or not CHOLMOD_AVAILABLE:
+        return None
+    
+    return cholmod_analyze(sp.csc_matrix(K))
+
+def factorize(K: sp.sparray, mixed_precision: bool = False, symbolic: Optional[Any] = None) -> Solver:
+    """
+    Factor a sparse stiffness matrix for repeated solves
+    
+    Args:
+        K: Sparse stiffness matrix
+        mixed_precision: Factor in float32 and refine in float64
+        symbolic: Result of analyze() for a matrix with the same pattern as K
+    
+    Raises:
+        np.linalg.LinAlgError: If the matrix is singular
+    """
+    if mixed_precision:
+        return _mixed_precision_solver(K)
+    
+    if PARDISO_AVAILABLE:
+        return _factorize_pardiso(K)
+    
+    K = sp.csc_matrix(K)
+    
+    if CHOLMOD_AVAILABLE:
+        try:
+            return symbolic.cholesky(K) if symbolic is not None else cholmod_cholesky(K)
+        except CholmodError as e:
+            # e.g. an indefinite tangent stiffness in nonlinear analysis
+            logger.warning(f"Cholesky factorization failed, falling back to LU: {e}")
+    
+    if UMFPACK_AVAILABLE:
+        return _factorize_umfpack(K)
+    
+    try:
+        # Stiffness matrices are structurally symmetric, so order for fill-in
+        # with minimum degree on A^T + A rather than SuperLU's default COLAMD
+        lu = splu(K, permc_spec='MMD_AT_PLUS_A')
+    except RuntimeError as e:
+        # SuperLU reports a singular matrix as RuntimeError
+        raise np.linalg.LinAlgError(str(e)) from e
+    
+    return _gpu_lu_solver(lu) if GPU_AVAILABLE else lu.solve
+
+def factorize_float32(K: sp.sparray) -> Solver:
+    """
+    Factor a float32 copy of K; solves return float64 without refinement
+    
+    For callers that check the float64 residual themselves, such as Newton
+    iterations, where an approximate step direction is enough.
+    """
+    try:
+        lu32 = splu(sp.csc_matrix(K, dtype=np.float32), permc_spec='MMD_AT_PLUS_A')
+    except RuntimeError:
+        # Singular in float32; let the float64 factorization decide
+        return factorize(K)
+    
+    return lambda F: lu32.solve(F.astype(np.float32)).astype(np.float64)
+
+def _factorize_pardiso(K: sp.sparray) -> Solver:
+    """
+    Factor with MKL PARDISO; the solver keeps the factorization of K between calls
+    
+    Symmetric positive definite matrices are factored by Cholesky from the
+    upper triangle alone, about half the work and memory of LU.
+    """
+    K = sp.csr_matrix(K)
+    K_upper = sp.triu(K, format='csr')
+    K_upper.sort_indices()
+    solver = PyPardisoSolver(mtype=PARDISO_SPD)
+    
+    try:
+        solver.factorize(K_upper)
+        return lambda F: solver.solve(K_upper, F)
+    except PyPardisoError as e:
+        # e.g. an indefinite tangent stiffness in nonlinear analysis
+        logger.warning(f"Cholesky factorization failed, falling back to LU: {e}")
+    except ValueError as e:
+        # Structurally singular (empty rows)
+        raise np.linalg.LinAlgError(str(e)) from e
+    
+    solver = PyPardisoSolver(mtype=PARDISO_NONSYMMETRIC)
+    
+    try:
+        solver.factorize(K)
+    except (PyPardisoError, ValueError) as e:
+        # ValueError: structurally singular (empty rows)
+        raise np.linalg.LinAlgError(str(e)) from e
+    
+    return lambda F: solver.solve(K, F)
+
+def _factorize_umfpack(K: sp.csc_matrix) -> Solver:
+    """Factor with UMFPACK; its solve takes one load vector at a time"""
+    try:
+        lu = umfpack_splu(K)
+    except RuntimeError as e:
+        raise np.linalg.LinAlgError(str(e)) from e
+    
+    def solve(F: np.ndarray) -> np.ndarray:
+        if F.ndim == 1:
+            return lu.solve(F)
+        return np.column_stack([lu.solve(F[:, j]) for j in range(F.shape[1])]).reshape(F.shape)
+    
+    return solve
+
+def _gpu_lu_solver(lu: SuperLU) -> Solver:
+    """
+    Wrap a SuperLU factorization so many-load-case solves run on the GPU
+    
+    SuperLU factors Pr K Pc = L U. The L and U factors are uploaded once, on
+    the first large solve; single load vectors and small batches are solved
+    on the CPU.
+    """
+    factors = {}
+    
+    def solve(F: np.ndarray) -> np.ndarray:
+        if F.ndim == 1 or F.shape[1] < GPU_MIN_LOAD_CASES:
+            return lu.solve(F)
+        
+        if not factors:
+            factors['L'] = gpu_csr_matrix(lu.L.tocsr())
+            factors['U'] = gpu_csr_matrix(lu.U.tocsr())
+        
+        # Row permutation on the way in, column permutation on the way out
+        permuted = np.empty_like(F)
+        permuted[lu.perm_r] = F
+        
+        y = gpu_spsolve_triangular(factors['L'], cupy.asarray(permuted), lower=True, unit_diagonal=True)
+        y = gpu_spsolve_triangular(factors['U'], y, lower=False)
+        
+        return cupy.asnumpy(y)[lu.perm_c]
+    
+    return solve
+
+def _mixed_precision_solver(K: sp.sparray) -> Solver:
+    """
+    Factor a float32 copy of K and refine each solve in float64
+    
+    Each refinement step costs one float64 matrix-vector product and one
+    float32 triangular solve. Matrices too ill-conditioned for float32 do
+    not converge; they fall back to a float64 factorization.
+    """
+    K64 = sp.csr_matrix(K, dtype=np.float64)
+    
+    try:
+        lu32 = splu(sp.csc_matrix(K, dtype=np.float32), permc_spec='MMD_AT_PLUS_A')
+    except RuntimeError:
+        # Singular in float32; let the float64 factorization decide
+        return factorize(K64)
+    
+    fallback = []
+    
+    def solve(F: np.ndarray) -> np.ndarray:
+        if fallback:
+            return fallback[0](F)
+        
+        u = lu32.solve(F.astype(np.float32)).astype(np.float64)
+        
+        for _ in range(MAX_REFINEMENT_STEPS):
+            residual = F - K64 @ u
+            if relative_residual(residual, F) <= RESIDUAL_TOLERANCE:
+                return u
+            u += lu32.solve(residual.astype(np.float32))
+        
+        logger.warning("Mixed-precision refinement did not converge, refactoring in float64")
+        fallback.append(factorize(K64))
+        return fallback[0](F)
+    
+    return solve
@@ -0,0 +1,153 @@
+"""
+Background analysis tasks executed by Celery workers
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, Any
+import numpy as np
+from redis.asyncio import Redis
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from celery.signals import worker_process_init
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core import jobs
+from app.db.database import SessionLocal, engine as db_engine
+from app.models.project import StructuralModel, AnalysisResult
+from app.schemas.analysis import AnalysisRequest, AnalysisStatus
+from app.core.analysis.engine import AnalysisEngine, AnalysisCancelled
+from app.core.analysis.linear import LinearAnalysis
+from app.core.analysis.nonlinear import NonlinearAnalysis
+
+@worker_process_init.connect
+def _reset_db_pool(**kwargs) -> None:
+    """Drop pooled connections inherited from the parent worker process"""
+    db_engine.dispose(close=False)
+
+@celery_app.task(name="analysis.run")
+def run_analysis_job(job_id: str, request_data: Dict[str, Any]) -> None:
+    """Celery entry point for a queued analysis job"""
+    request = AnalysisRequest.model_validate(request_data)
+    asyncio.run(run_analysis_task(job_id, request))
+
+async def run_analysis_task(
+    job_id: str,
+    request: AnalysisRequest
+):
+    """Run an analysis job, recording progress in Redis"""
+    
+    # Fresh client per run: each Celery task executes in its own event loop
+    r = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    
+    # The task owns its session for exactly its own lifetime; request-scoped
+    # sessions are closed as soon as the response is sent
+    try:
+        with SessionLocal() as db:
+            await _execute_analysis(r, job_id, request, db)
+    finally:
+        await r.aclose()
+
+async def _execute_analysis(
+    r: Redis,
+    job_id: str,
+    request: AnalysisRequest,
+    db: Session
+):
+    """Execute the analysis and save its results"""
+    # A job cancelled while still queued is not started
+    if not await jobs.start_job(r, job_id, started_at=datetime.utcnow(), progress=10.0):
+        return
+    
+    try:
+        # Get model data
+        model = db.query(StructuralModel).filter(
+            StructuralModel.id == request.model_id
+        ).first()
+        
+        # Initialize analysis engine
+        engine = AnalysisEngine(model)
+        await jobs.update_job(r, job_id, progress=20.0)
+        
+        # Run analysis based on type
+        if request.settings.analysis_type == "linear":
+            analyzer = LinearAnalysis(engine)
+        elif request.settings.analysis_type == "nonlinear":
+            analyzer = NonlinearAnalysis(engine)
+        else:
+            raise ValueError(f"Unsupported analysis type: {request.settings.analysis_type}")
+        
+        await jobs.update_job(r, job_id, progress=30.0)
+        
+        # Execute analysis
+        results = await analyzer.run(
+            request.load_case_ids,
+            request.settings,
+            is_cancelled=lambda: jobs.is_cancelled(r, job_id)
+        )
+        
+        # Discard results of a job cancelled during its last load case
+        if await jobs.is_cancelled(r, job_id):
+            return
+        
+        await jobs.update_job(r, job_id, progress=90.0)
+        
+        # Save results if requested (one multi-row INSERT for all load cases)
+        if request.save_results and results:
+            rows = [
+                dict(
+                    model_id=request.model_id,
+                    analysis_type=request.settings.analysis_type,
+                    load_case_id=load_case_id,
+                    node_results=result["node_results"],
+                    element_results=result["element_results"],
+                    analysis_time=result["analysis_time"],
+                    convergence_info=result["convergence_info"],
+                    **_summarize_results(result["node_results"], result["element_results"])
+                )
+                for load_case_id, result in results.items()
+            ]
+            db.execute(insert(AnalysisResult), rows)
+            db.commit()
+        
+        # Update job completion; a cancel that arrived since the last check
+        # keeps its status
+        await jobs.finish_job(
+            r, job_id,
+            status=AnalysisStatus.COMPLETED,
+            completed_at=datetime.utcnow(),
+            progress=100.0
+        )
+        
+    except AnalysisCancelled:
+        # cancel_job has already recorded the cancelled status
+        return
+    except Exception as e:
+        # finish_job leaves a cancelled job's status alone
+        await jobs.finish_job(
+            r, job_id,
+            status=AnalysisStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow()
+        )
+
+def _max_abs(results: Dict[str, Any], key: str) -> float:
+    """Largest absolute numeric value of ``key`` across all entries of a result dict"""
+    values = np.fromiter(
+        (
+            v
+            for entry in (results or {}).values() if isinstance(entry, dict)
+            for v in entry.get(key, {}).values() if isinstance(v, (int, float))
+        ),
+        dtype=np.float64
+    )
+    return float(np.abs(values).max()) if values.size else 0.0
+
+def _summarize_results(node_results: Dict[str, Any], element_results: Dict[str, Any]) -> Dict[str, float]:
+    """Calculate summary statistics stored alongside analysis results"""
+    return {
+        "max_displacement": _max_abs(node_results, "displacements"),
+        "max_stress": _max_abs(element_results, "stresses"),
+        "max_reaction": _max_abs(node_results, "reactions")
+    }
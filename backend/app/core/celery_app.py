@@ -0,0 +1,23 @@
+"""
+Celery application for CPU-bound background work
+"""
+
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "strumind",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=["app.core.analysis.tasks"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    task_time_limit=settings.ANALYSIS_TIMEOUT,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1  # Analysis jobs are long; don't hoard them
+)
@@ -3,15 +3,147 @@ Core design engine for structural design checks
 """
 
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+from uuid import UUID
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import IntEnum
 import logging
+import os
 
 from app.models.project import StructuralModel, Element, Material, Section
-from app.schemas.design import DesignSettings, DesignCheckResult, ElementDesignResult
+from app.schemas.design import DesignSettings, DesignCheckResult, DesignCheckType, DesignStatus, ElementDesignResult
 
 logger = logging.getLogger(__name__)
 
+# Analysis force results read for design, in ElementForces field order
+FORCE_RESULT_NAMES = ['axial', 'shear_y', 'shear_z', 'torsion', 'moment_y', 'moment_z']
+
+# Smallest element count for which design checks are spread over worker processes
+PARALLEL_DESIGN_MIN_ELEMENTS = 2000
+
+# Check types are stored in check records as their index in CHECK_TYPES
+CHECK_TYPES = tuple(DesignCheckType)
+CHECK_TYPE_CODES = {check_type: code for code, check_type in enumerate(CHECK_TYPES)}
+
+class Equation(IntEnum):
+    """Governing equation codes stored in check records"""
+    NONE = 0
+    AISC_D2_1 = 1
+    AISC_D2_2 = 2
+    AISC_E3 = 3
+    AISC_F2 = 4
+    AISC_H1_1A = 5
+    AISC_H1_1B = 6
+    AISC_G2 = 7
+
+# Display text of each Equation, indexed by code
+EQUATIONS = (
+    None,
+    "AISC 360 D2-1", "AISC 360 D2-2", "AISC 360 E3", "AISC 360 F2",
+    "AISC 360 H1-1a", "AISC 360 H1-1b", "AISC 360 G2"
+)
+EQUATION_CODES = {text: Equation(code) for code, text in enumerate(EQUATIONS)}
+
+# One record per design check; results are kept in this form and only turned
+# into DesignCheckResult objects by DesignEngine.results_to_schema
+CHECK_DTYPE = np.dtype([
+    ('element_idx', 'i4'),  # Row in DesignElements
+    ('check_type', 'u1'),   # Index into CHECK_TYPES
+    ('demand', 'f8'),
+    ('capacity', 'f8'),
+    ('ratio', 'f8'),
+    ('equation', 'u1')      # Equation code
+])
+
+# Design engine and settings of the current worker process, set by _init_design_worker
+_worker_engine: Optional['DesignEngine'] = None
+_worker_settings: Optional[DesignSettings] = None
+
+class ElementForces(NamedTuple):
+    """Design forces of one element"""
+    P: float   # Axial force
+    Vx: float  # Shear force X
+    Vy: float  # Shear force Y
+    T: float   # Torsion
+    Mx: float  # Moment about X
+    My: float  # Moment about Y
+
+def _init_design_worker(engine: 'DesignEngine', settings: DesignSettings) -> None:
+    """Store the design engine and settings once per worker process"""
+    global _worker_engine, _worker_settings
+    _worker_engine = engine
+    _worker_settings = settings
+
+def _check_design_rows(rows: range) -> np.ndarray:
+    """Run the design checks of a range of element rows in a worker process"""
+    return _worker_engine._check_rows(rows, _worker_settings)
+
+def make_checks(element_idx: np.ndarray, check_type: DesignCheckType, demand: Any, capacity: Any,
+                equation: Any) -> np.ndarray:
+    """
+    Check records of one limit state for a batch of elements
+    
+    demand, capacity and equation (an Equation) are arrays over the
+    elements or scalars.
+    """
+    checks = np.empty(len(element_idx), dtype=CHECK_DTYPE)
+    checks['element_idx'] = element_idx
+    checks['check_type'] = CHECK_TYPE_CODES[check_type]
+    checks['demand'] = demand
+    checks['capacity'] = capacity
+    checks['equation'] = equation
+    
+    capacity = checks['capacity']
+    np.divide(checks['demand'], capacity, out=checks['ratio'], where=capacity > 0)
+    checks['ratio'][~(capacity > 0)] = np.inf
+    
+    return checks
+
+def check_status(ratio: float) -> DesignStatus:
+    """Status of a design check with the given demand/capacity ratio"""
+    if ratio <= 1.0:
+        return "WARNING" if ratio >= 0.9 else "PASS"
+    return "FAIL"
+
+def _property_column(rows: List[Any], attribute: str, default: float) -> np.ndarray:
+    """Gather one property of all rows into an array, followed by a defaults row"""
+    values = np.fromiter((getattr(row, attribute) or default for row in rows), dtype=np.float64, count=len(rows))
+    return np.append(values, default)
+
+@dataclass
+class DesignElements:
+    """Struct-of-arrays data of the elements under design, one row per element"""
+    ids: List[UUID]
+    numbers: np.ndarray  # User-defined element numbers
+    types: List[str]
+    material_idx: np.ndarray  # Row in DesignMaterials
+    section_idx: np.ndarray  # Row in DesignSections
+    length: np.ndarray
+
+@dataclass
+class DesignMaterials:
+    """Struct-of-arrays material data; the last row holds defaults for unknown materials"""
+    names: List[str]
+    types: List[str]
+    E: np.ndarray
+    fy: np.ndarray
+    fu: np.ndarray
+
+@dataclass
+class DesignSections:
+    """Struct-of-arrays section data; the last row holds defaults for unknown sections"""
+    names: List[str]
+    A: np.ndarray
+    Ix: np.ndarray
+    Iy: np.ndarray
+    Zx: np.ndarray
+    Zy: np.ndarray
+    rx: np.ndarray
+    ry: np.ndarray
+    J: np.ndarray
+
 class DesignEngine:
     """
     Core structural design engine
@@ -24,60 +156,84 @@ class DesignEngine:
     def __init__(self, model: StructuralModel):
         """Initialize design engine with structural model"""
         self.model = model
-        self.elements: Dict[str, Dict[str, Any]] = {}
-        self.materials: Dict[str, Dict[str, Any]] = {}
-        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.elements: Optional[DesignElements] = None
+        self.materials: Optional[DesignMaterials] = None
+        self.sections: Optional[DesignSections] = None
+        self.material_id_to_index: Dict[UUID, int] = {}
+        self.section_id_to_index: Dict[UUID, int] = {}
+        
+        # Analysis forces per element row, columns in ElementForces order
+        self.element_forces = np.empty((0, 6))
         
         logger.info(f"Initialized design engine for model {model.id}")
     
-    def prepare_design_data(self, element_ids: List[str], analysis_results: Dict[str, Any]) -> None:
+    def prepare_design_data(self, element_ids: List[UUID], analysis_results: Dict[str, Any]) -> None:
         """Prepare design data from analysis results"""
         logger.info("Preparing design data...")
         
-        # Process elements
-        for element in self.model.elements:
-            if element.id in element_ids:
-                self.elements[element.id] = {
-                    'element_id': element.element_id,
-                    'type': element.element_type,
-                    'material_id': element.material_id,
-                    'section_id': element.section_id,
-                    'length': self._calculate_element_length(element),
-                    'properties': element.properties or {}
-                }
-        
         # Process materials
-        for material in self.model.materials:
-            self.materials[material.id] = {
-                'name': material.name,
-                'type': material.material_type,
-                'E': material.elastic_modulus or 200000.0,
-                'fy': material.yield_strength or 250.0,
-                'fu': material.ultimate_strength or 400.0,
-                'properties': material.properties or {}
-            }
+        model_materials = list(self.model.materials)
+        self.material_id_to_index = {material.id: index for index, material in enumerate(model_materials)}
+        self.materials = DesignMaterials(
+            names=[material.name for material in model_materials] + ['Unknown'],
+            types=[material.material_type for material in model_materials] + ['steel'],
+            E=_property_column(model_materials, 'elastic_modulus', 200000.0),
+            fy=_property_column(model_materials, 'yield_strength', 250.0),
+            fu=_property_column(model_materials, 'ultimate_strength', 400.0)
+        )
         
         # Process sections
-        for section in self.model.sections:
-            self.sections[section.id] = {
-                'name': section.name,
-                'type': section.section_type,
-                'A': section.area or 1.0,
-                'Ix': section.moment_inertia_y or 1.0,
-                'Iy': section.moment_inertia_z or 1.0,
-                'Zx': section.section_modulus_y or 1.0,
-                'Zy': section.section_modulus_z or 1.0,
-                'rx': np.sqrt((section.moment_inertia_y or 1.0) / (section.area or 1.0)),
-                'ry': np.sqrt((section.moment_inertia_z or 1.0) / (section.area or 1.0)),
-                'J': section.torsional_constant or 1.0,
-                'dimensions': section.dimensions or {},
-                'properties': section.properties or {}
-            }
+        model_sections = list(self.model.sections)
+        self.section_id_to_index = {section.id: index for index, section in enumerate(model_sections)}
+        
+        A = _property_column(model_sections, 'area', 1.0)
+        Ix = _property_column(model_sections, 'moment_inertia_y', 1.0)
+        Iy = _property_column(model_sections, 'moment_inertia_z', 1.0)
+        
+        self.sections = DesignSections(
+            names=[section.name for section in model_sections] + ['Unknown'],
+            A=A,
+            Ix=Ix,
+            Iy=Iy,
+            Zx=_property_column(model_sections, 'section_modulus_y', 1.0),
+            Zy=_property_column(model_sections, 'section_modulus_z', 1.0),
+            # Radii of gyration for all sections in one vectorized sqrt
+            rx=np.sqrt(Ix / A),
+            ry=np.sqrt(Iy / A),
+            J=_property_column(model_sections, 'torsional_constant', 1.0)
+        )
+        
+        # Process elements; unknown material/section ids map to the defaults rows
+        wanted = set(element_ids)
+        design_elements = [element for element in self.model.elements if element.id in wanted]
+        self.elements = DesignElements(
+            ids=[element.id for element in design_elements],
+            numbers=np.array([element.element_id for element in design_elements], dtype=np.int64),
+            types=[element.element_type for element in design_elements],
+            material_idx=np.array(
+                [self.material_id_to_index.get(element.material_id, len(model_materials)) for element in design_elements],
+                dtype=np.int32
+            ),
+            section_idx=np.array(
+                [self.section_id_to_index.get(element.section_id, len(model_sections)) for element in design_elements],
+                dtype=np.int32
+            ),
+            length=np.array([self._calculate_element_length(element) for element in design_elements], dtype=np.float64)
+        )
         
         # Store analysis results
         self.analysis_results = analysis_results
         
-        logger.info(f"Design data prepared for {len(self.elements)} elements")
+        # Read each element's forces out of the nested results once; elements
+        # without results get zero forces
+        element_results = analysis_results.get('element_results', {})
+        self.element_forces = np.zeros((len(design_elements), 6))
+        
+        for row, element_number in enumerate(self.elements.numbers.tolist()):
+            forces = element_results.get(str(element_number), {}).get('forces', {})
+            self.element_forces[row] = [forces.get(name, 0.0) for name in FORCE_RESULT_NAMES]
+        
+        logger.info(f"Design data prepared for {len(self.elements.ids)} elements")
     
     def _calculate_element_length(self, element) -> float:
         """Calculate element length from node coordinates"""
@@ -85,30 +241,151 @@ class DesignEngine:
         # Simplified for now
         return 1.0
     
-    def run_design_checks(self, settings: DesignSettings) -> List[ElementDesignResult]:
-        """Run design checks for all elements"""
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle only the design arrays; worker processes never touch the ORM model"""
+        state = self.__dict__.copy()
+        state['model'] = None
+        state['analysis_results'] = None
+        return state
+    
+    def run_design_checks(self, settings: DesignSettings) -> np.ndarray:
+        """
+        Run design checks for all elements
+        
+        Returns:
+            Check records (CHECK_DTYPE) of all elements, grouped by element
+            row; results_to_schema builds the API result objects from them
+        """
         logger.info(f"Running design checks using {settings.design_code}")
         
-        results = []
+        n_elements = len(self.elements.ids)
+        n_cpu = os.cpu_count() or 1
         
-        for element_id, element_data in self.elements.items():
-            logger.info(f"Checking element {element_data['element_id']}")
+        if n_elements < PARALLEL_DESIGN_MIN_ELEMENTS or n_cpu == 1:
+            results = self._check_rows(range(n_elements), settings)
+        else:
+            # Elements are checked independently, so row chunks are spread over
+            # worker processes; the engine is sent to each worker once
+            chunk_size = max(1, n_elements // (4 * n_cpu))
+            chunks = [range(start, min(start + chunk_size, n_elements)) for start in range(0, n_elements, chunk_size)]
+            
+            with ProcessPoolExecutor(max_workers=n_cpu, initializer=_init_design_worker,
+                                     initargs=(self, settings)) as pool:
+                results = np.concatenate(list(pool.map(_check_design_rows, chunks)))
+        
+        logger.info(f"Design checks completed for {n_elements} elements")
+        return results
+    
+    def _check_rows(self, rows: range, settings: DesignSettings) -> np.ndarray:
+        """Run design checks for a range of element rows"""
+        rows = np.arange(rows.start, rows.stop)
+        chunks = [np.empty(0, dtype=CHECK_DTYPE)]
+        
+        # The design checker depends only on the material, so the elements of
+        # each material are checked in one batch
+        material_idx = self.elements.material_idx[rows]
+        
+        for m in np.unique(material_idx).tolist():
+            positions = np.flatnonzero(material_idx == m)
             
             # Get design checker based on material type and design code
-            checker = self._get_design_checker(element_data, settings)
+            checker = self._get_design_checker(int(rows[positions[0]]), settings)
             
             # Run design checks
-            element_result = checker.check_element(element_id, element_data, settings)
-            results.append(element_result)
+            chunks.append(checker.check_elements(rows[positions], settings))
+        
+        # Group the records by element, keeping each element's check order
+        checks = np.concatenate(chunks)
+        return checks[np.argsort(checks['element_idx'], kind='stable')]
+    
+    def results_to_schema(self, checks: np.ndarray, settings: DesignSettings,
+                          rows: Optional[List[int]] = None) -> List[ElementDesignResult]:
+        """
+        Build the API design results from check records
+        
+        Args:
+            checks: Check records (CHECK_DTYPE) grouped by element row
+            settings: Design settings the checks were run with
+            rows: Element rows to report, all elements by default
+        """
+        rows = np.arange(len(self.elements.ids)) if rows is None else np.asarray(rows)
+        
+        # Each element's records are one contiguous slice
+        element_idx = checks['element_idx']
+        starts = np.searchsorted(element_idx, rows, side='left').tolist()
+        stops = np.searchsorted(element_idx, rows, side='right').tolist()
+        
+        checkers: Dict[int, DesignChecker] = {}
+        results = []
+        
+        for index, start, stop in zip(rows.tolist(), starts, stops):
+            element_checks = checks[start:stop]
+            
+            # Details are only worked out here, for the elements reported
+            m = int(self.elements.material_idx[index])
+            if m not in checkers:
+                checkers[m] = self._get_design_checker(index, settings)
+            details = checkers[m].check_details(index, element_checks, settings)
+            
+            results.append(self._element_result(index, element_checks, details))
         
-        logger.info(f"Design checks completed for {len(results)} elements")
         return results
     
-    def _get_design_checker(self, element_data: Dict[str, Any], settings: DesignSettings):
+    def _element_result(self, index: int, checks: np.ndarray, details: List[Dict[str, Any]]) -> ElementDesignResult:
+        """
+        Summarize the check records of the element in row index
+        
+        All values come from the engine's own arrays and already have the
+        schema types, so the result objects are built without validation.
+        """
+        elements = self.elements
+        recommendations = []
+        
+        design_checks = tuple(
+            DesignCheckResult.model_construct(
+                check_type=CHECK_TYPES[check_type],
+                demand=demand,
+                capacity=capacity,
+                ratio=ratio,
+                status=check_status(ratio),
+                governing_equation=EQUATIONS[equation],
+                details=check_details
+            )
+            for (_, check_type, demand, capacity, ratio, equation), check_details in zip(checks.tolist(), details)
+        )
+        
+        # Determine overall status
+        controlling_ratio = 0.0
+        controlling_check = None
+        
+        if len(checks):
+            max_idx = int(np.argmax(checks['ratio']))
+            controlling_ratio = float(checks['ratio'][max_idx])
+            controlling_check = CHECK_TYPES[checks['check_type'][max_idx]]
+        
+        overall_status = "PASS"
+        if controlling_ratio > 1.0:
+            overall_status = "FAIL"
+            recommendations.append("Consider increasing section size")
+        elif controlling_ratio > 0.9:
+            overall_status = "WARNING"
+            recommendations.append("Section utilization is high")
+        
+        return ElementDesignResult.model_construct(
+            element_id=elements.ids[index],
+            element_type=elements.types[index],
+            section_name=self.sections.names[elements.section_idx[index]],
+            material_name=self.materials.names[elements.material_idx[index]],
+            design_checks=design_checks,
+            controlling_ratio=controlling_ratio,
+            controlling_check=controlling_check,
+            overall_status=overall_status,
+            recommendations=tuple(recommendations)
+        )
+    
+    def _get_design_checker(self, index: int, settings: DesignSettings):
         """Get appropriate design checker based on material and code"""
-        material_id = element_data['material_id']
-        material = self.materials.get(material_id, {})
-        material_type = material.get('type', 'steel')
+        material_type = self.materials.types[self.elements.material_idx[index]]
         
         if material_type == 'steel':
             if settings.design_code.value.startswith('AISC'):
@@ -131,55 +408,89 @@ class DesignChecker(ABC):
     
     def __init__(self, engine: DesignEngine):
         self.engine = engine
+        
+        # Property dicts by material/section table row; elements sharing a
+        # material or section share the dict
+        self._material_cache: Dict[int, Dict[str, Any]] = {}
+        self._section_cache: Dict[int, Dict[str, Any]] = {}
+    
+    def reset(self) -> None:
+        """Drop cached properties, e.g. after the engine's design data was prepared again"""
+        self._material_cache.clear()
+        self._section_cache.clear()
     
     @abstractmethod
-    def check_element(self, element_id: str, element_data: Dict[str, Any], 
-                     settings: DesignSettings) -> ElementDesignResult:
-        """Check a single element"""
+    def check_element(self, index: int, settings: DesignSettings) -> ElementDesignResult:
+        """Check the element in row index of the engine's element arrays"""
         pass
     
-    def get_element_forces(self, element_id: str) -> Dict[str, float]:
-        """Get analysis forces for element"""
-        # Extract forces from analysis results
-        element_data = self.engine.elements[element_id]
-        element_number = element_data['element_id']
-        
-        # Get from analysis results
-        element_results = self.engine.analysis_results.get('element_results', {})
-        forces = element_results.get(str(element_number), {}).get('forces', {})
-        
-        return {
-            'P': forces.get('axial', 0.0),      # Axial force
-            'Vx': forces.get('shear_y', 0.0),   # Shear force X
-            'Vy': forces.get('shear_z', 0.0),   # Shear force Y
-            'T': forces.get('torsion', 0.0),    # Torsion
-            'Mx': forces.get('moment_y', 0.0),  # Moment about X
-            'My': forces.get('moment_z', 0.0),  # Moment about Y
-        }
-    
-    def get_material_properties(self, material_id: str) -> Dict[str, float]:
-        """Get material properties"""
-        return self.engine.materials.get(material_id, {})
-    
-    def get_section_properties(self, section_id: str) -> Dict[str, float]:
-        """Get section properties"""
-        return self.engine.sections.get(section_id, {})
+    def check_elements(self, rows: np.ndarray, settings: DesignSettings) -> np.ndarray:
+        """Check records of the elements in the given rows; checkers with batch formulas override this"""
+        records = [
+            (index, CHECK_TYPE_CODES[check.check_type], check.demand, check.capacity, check.ratio,
+             EQUATION_CODES.get(check.governing_equation, Equation.NONE))
+            for index in rows.tolist()
+            for check in self.check_element(index, settings).design_checks
+        ]
+        return np.array(records, dtype=CHECK_DTYPE)
+    
+    def check_details(self, index: int, checks: np.ndarray, settings: DesignSettings) -> List[Dict[str, Any]]:
+        """Details of the check records of the element in row index, in record order"""
+        return [check.details for check in self.check_element(index, settings).design_checks]
+    
+    def get_element_forces(self, index: int) -> ElementForces:
+        """Get analysis forces for the element in row index"""
+        return ElementForces(*self.engine.element_forces[index].tolist())
+    
+    def get_material_properties(self, index: int) -> Dict[str, Any]:
+        """Get material properties of the element in row index (shared dict, do not modify)"""
+        m = int(self.engine.elements.material_idx[index])
+        properties = self._material_cache.get(m)
+        
+        if properties is None:
+            materials = self.engine.materials
+            properties = self._material_cache[m] = {
+                'name': materials.names[m],
+                'type': materials.types[m],
+                'E': float(materials.E[m]),
+                'fy': float(materials.fy[m]),
+                'fu': float(materials.fu[m])
+            }
+        
+        return properties
+    
+    def get_section_properties(self, index: int) -> Dict[str, Any]:
+        """Get section properties of the element in row index (shared dict, do not modify)"""
+        s = int(self.engine.elements.section_idx[index])
+        properties = self._section_cache.get(s)
+        
+        if properties is None:
+            sections = self.engine.sections
+            properties = self._section_cache[s] = {
+                'name': sections.names[s],
+                'A': float(sections.A[s]),
+                'Ix': float(sections.Ix[s]),
+                'Iy': float(sections.Iy[s]),
+                'Zx': float(sections.Zx[s]),
+                'Zy': float(sections.Zy[s]),
+                'rx': float(sections.rx[s]),
+                'ry': float(sections.ry[s]),
+                'J': float(sections.J[s])
+            }
+        
+        return properties
     
     def create_design_check(self, check_type: str, demand: float, capacity: float,
                           equation: str = None, details: Dict[str, Any] = None) -> DesignCheckResult:
         """Create a design check result"""
         ratio = demand / capacity if capacity > 0 else float('inf')
-        status = "PASS" if ratio <= 1.0 else "FAIL"
-        
-        if 0.9 <= ratio <= 1.0:
-            status = "WARNING"
         
         return DesignCheckResult(
             check_type=check_type,
             demand=demand,
             capacity=capacity,
             ratio=ratio,
-            status=status,
+            status=check_status(ratio),
             governing_equation=equation,
             details=details or {}
         )
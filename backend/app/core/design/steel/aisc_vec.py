@@ -0,0 +1,132 @@
+"""
+Vectorized AISC 360 steel design formulas
+
+Each function evaluates one group of limit states for many elements at
+once. Inputs are 1-D arrays with one entry per element (scalars broadcast),
+and the results are named tuples of arrays in the same element order.
+The compression and combined formulas run as compiled Numba kernels when
+Numba is installed.
+"""
+
+import numpy as np
+from typing import NamedTuple
+
+from app.core.design.steel.aisc_kernels import NUMBA_AVAILABLE, LN_0_658, PI2, compression_all, combined_all
+
+class TensionCapacity(NamedTuple):
+    """Tension capacities per element (AISC 360 Chapter D)"""
+    Pn_yield: np.ndarray    # Nominal strength, yielding of gross section
+    Pr_yield: np.ndarray    # Design strength, yielding of gross section
+    Ae: np.ndarray          # Effective net area
+    Pn_rupture: np.ndarray  # Nominal strength, rupture of net section
+    Pr_rupture: np.ndarray  # Design strength, rupture of net section
+
+class CompressionCapacity(NamedTuple):
+    """Compression capacities per element (AISC 360 Chapter E)"""
+    KL_r: np.ndarray       # Governing slenderness ratio
+    Fe: np.ndarray         # Elastic buckling stress
+    lambda_c: np.ndarray   # Slenderness parameter
+    inelastic: np.ndarray  # True where inelastic buckling governs
+    Fcr: np.ndarray        # Critical stress
+    Pn: np.ndarray         # Nominal strength
+    Pr: np.ndarray         # Design strength
+
+class FlexureCapacity(NamedTuple):
+    """Flexural capacities per element (AISC 360 Chapter F)"""
+    Mn_x: np.ndarray  # Nominal strength, major axis
+    Mr_x: np.ndarray  # Design strength, major axis
+    Mn_y: np.ndarray  # Nominal strength, minor axis
+    Mr_y: np.ndarray  # Design strength, minor axis
+
+class CombinedRatio(NamedTuple):
+    """Interaction ratios per element (AISC 360 Chapter H)"""
+    ratio: np.ndarray   # Interaction ratio
+    h1a: np.ndarray     # True where H1-1a governs, False for H1-1b
+    P_Pr: np.ndarray    # Axial utilization
+    Mx_Mrx: np.ndarray  # Major axis flexural utilization
+    My_Mry: np.ndarray  # Minor axis flexural utilization
+
+class ShearCapacity(NamedTuple):
+    """Shear demand and capacities per element (AISC 360 Chapter G)"""
+    V: np.ndarray   # Resultant shear force
+    Cv: np.ndarray  # Web shear coefficient
+    Vn: np.ndarray  # Nominal strength
+    Vr: np.ndarray  # Design strength
+
+def compute_tension(A: np.ndarray, Fy: np.ndarray, Fu: np.ndarray, phi_t: float) -> TensionCapacity:
+    """Yielding (D2-1) and rupture (D2-2) tension capacities"""
+    # Yielding of gross section (AISC 360 D2-1)
+    Pn_yield = Fy * A
+    
+    # Rupture of net section (AISC 360 D2-2)
+    # Simplified - assumes Ae = 0.85 * Ag for bolted connections, phi = 0.75
+    Ae = 0.85 * A
+    Pn_rupture = Fu * Ae
+    
+    return TensionCapacity(Pn_yield, phi_t * Pn_yield, Ae, Pn_rupture, 0.75 * Pn_rupture)
+
+def compute_compression(A: np.ndarray, Fy: np.ndarray, E: np.ndarray, L: np.ndarray,
+                        Kx: float, Ky: float, rx: np.ndarray, ry: np.ndarray,
+                        phi_c: float) -> CompressionCapacity:
+    """Flexural buckling compression capacity (E3)"""
+    if NUMBA_AVAILABLE:
+        out = np.empty((6, len(A)))
+        compression_all(A, Fy, E, L, float(Kx), float(Ky), rx, ry, float(phi_c), out)
+        KL_r, Fe, lambda_c, Fcr, Pn, Pr = out
+        return CompressionCapacity(KL_r, Fe, lambda_c, lambda_c <= 1.5, Fcr, Pn, Pr)
+    
+    # Governing slenderness ratio
+    KL_r = np.maximum((Kx * L) / rx, (Ky * L) / ry)
+    
+    # Elastic buckling stress
+    Fe = (PI2 * E) / (KL_r * KL_r)
+    lambda_c = np.sqrt(Fy / Fe)
+    
+    # Inelastic (AISC 360 E3-2) or elastic (AISC 360 E3-3) buckling
+    inelastic = lambda_c <= 1.5
+    Fcr = np.where(inelastic, np.exp(LN_0_658 * (lambda_c * lambda_c)) * Fy, 0.877 * Fe)
+    
+    Pn = Fcr * A
+    return CompressionCapacity(KL_r, Fe, lambda_c, inelastic, Fcr, Pn, phi_c * Pn)
+
+def compute_flexure(Zx: np.ndarray, Zy: np.ndarray, Fy: np.ndarray, phi_b: float) -> FlexureCapacity:
+    """Yielding flexural capacities about both axes (F2)"""
+    # Simplified - assumes compact sections (plastic moment)
+    Mn_x = Fy * Zx
+    Mn_y = Fy * Zy
+    
+    return FlexureCapacity(Mn_x, phi_b * Mn_x, Mn_y, phi_b * Mn_y)
+
+def compute_combined(P: np.ndarray, Mx: np.ndarray, My: np.ndarray,
+                     Pr: np.ndarray, Mrx: np.ndarray, Mry: np.ndarray) -> CombinedRatio:
+    """
+    Axial-flexure interaction ratios (H1-1a / H1-1b)
+    
+    P, Mx and My are demand magnitudes. A term is zero where its capacity is
+    not positive, and a flexure term is zero about an axis without moment,
+    so no division by zero produces inf or NaN.
+    """
+    if NUMBA_AVAILABLE:
+        out = np.empty((5, len(P)))
+        combined_all(P, Mx, My, Pr, Mrx, Mry, out)
+        ratio, h1a, P_Pr, Mx_Mrx, My_Mry = out
+        return CombinedRatio(ratio, h1a > 0.0, P_Pr, Mx_Mrx, My_Mry)
+    
+    P_Pr = np.divide(P, Pr, out=np.zeros_like(P), where=Pr > 0)
+    Mx_Mrx = np.divide(Mx, Mrx, out=np.zeros_like(Mx), where=(Mx > 1e-6) & (Mrx > 0))
+    My_Mry = np.divide(My, Mry, out=np.zeros_like(My), where=(My > 1e-6) & (Mry > 0))
+    flexure = Mx_Mrx + My_Mry
+    
+    h1a = P_Pr >= 0.2
+    ratio = np.where(h1a, P_Pr + (8.0/9.0) * flexure, 0.5 * P_Pr + flexure)
+    
+    return CombinedRatio(ratio, h1a, P_Pr, Mx_Mrx, My_Mry)
+
+def compute_shear(Vx: np.ndarray, Vy: np.ndarray, A: np.ndarray, Fy: np.ndarray, phi_v: float) -> ShearCapacity:
+    """Resultant shear demand and web shear capacity (G2)"""
+    # Simplified shear check - assumes web controls
+    # For more detailed check, would need web dimensions
+    Cv = np.ones_like(A)
+    Vn = 0.6 * Fy * A * Cv
+    
+    return ShearCapacity(np.hypot(Vx, Vy), Cv, Vn, phi_v * Vn)
@@ -0,0 +1,132 @@
+"""
+Analysis job state storage
+
+Job state is kept in Redis hashes keyed by ``job:{id}`` so that it survives
+restarts and is shared by every API worker.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Any, Optional, Tuple
+import orjson
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from app.core.config import settings
+from app.schemas.analysis import AnalysisStatus
+
+ACTIVE_JOBS_KEY = "jobs:active"
+
+ACTIVE_STATUSES = (AnalysisStatus.PENDING, AnalysisStatus.RUNNING)
+FINISHED_STATUSES = (AnalysisStatus.COMPLETED, AnalysisStatus.FAILED, AnalysisStatus.CANCELLED)
+
+def job_key(job_id: str) -> str:
+    """Redis key holding the state of a job"""
+    return f"job:{job_id}"
+
+def cancel_key(job_id: str) -> str:
+    """Redis key of the cancellation flag polled by the running analysis"""
+    return f"job:{job_id}:cancelled"
+
+def _encode(value: Any) -> str:
+    """Encode a job field as a Redis hash value"""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return orjson.dumps(value.model_dump(mode="json")).decode()
+    return str(value)
+
+async def create_job(r: Redis, job: Dict[str, Any]) -> None:
+    """Store a new job and mark it active"""
+    key = job_key(job["id"])
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping={field: _encode(value) for field, value in job.items()})
+        pipe.expire(key, settings.ANALYSIS_JOB_TTL)
+        pipe.sadd(ACTIVE_JOBS_KEY, job["id"])
+        await pipe.execute()
+
+async def update_job(r: Redis, job_id: str, **fields: Any) -> None:
+    """Update fields of an existing job"""
+    await r.hset(job_key(job_id), mapping={field: _encode(value) for field, value in fields.items()})
+
+async def start_job(r: Redis, job_id: str, **fields: Any) -> bool:
+    """Mark a pending job as running; False if it was cancelled while queued"""
+    previous = await _transition(r, job_id, (AnalysisStatus.PENDING,), {"status": AnalysisStatus.RUNNING, **fields})
+    return previous == AnalysisStatus.PENDING
+
+async def finish_job(r: Redis, job_id: str, **fields: Any) -> bool:
+    """Record the final state of an active job; False if it had already finished or was cancelled"""
+    previous = await _transition(r, job_id, ACTIVE_STATUSES, fields, finish=True)
+    return previous in ACTIVE_STATUSES
+
+async def get_job(r: Redis, job_id: str) -> Optional[Dict[str, Any]]:
+    """Get job state, or None if the job does not exist"""
+    data = await r.hgetall(job_key(job_id))
+    if not data:
+        return None
+    
+    # Empty strings encode None; the serialized request is not part of the job view
+    return {field: value or None for field, value in data.items() if field != "request"}
+
+async def is_cancelled(r: Redis, job_id: str) -> bool:
+    """Check whether cancellation of a job has been requested"""
+    return bool(await r.exists(cancel_key(job_id)))
+
+async def cancel_job(r: Redis, job_id: str) -> Optional[str]:
+    """
+    Atomically mark a job as cancelled unless it has already finished
+    
+    The cancellation flag tells the worker running the job to stop.
+    
+    Returns:
+        The status before cancellation, or None if the job does not exist
+    """
+    fields = {"status": AnalysisStatus.CANCELLED, "completed_at": datetime.utcnow()}
+    return await _transition(r, job_id, ACTIVE_STATUSES, fields, finish=True, cancel=True)
+
+async def _transition(
+    r: Redis,
+    job_id: str,
+    from_statuses: Tuple[AnalysisStatus, ...],
+    fields: Dict[str, Any],
+    finish: bool = False,
+    cancel: bool = False
+) -> Optional[str]:
+    """
+    Update a job only while its status is one of from_statuses
+    
+    Only the status field is read (HGET), and the check-and-set runs under
+    WATCH/MULTI so concurrent transitions cannot overwrite each other.
+    finish also removes the job from the active set; cancel also raises
+    its cancellation flag.
+    
+    Returns:
+        The status before the update, or None if the job does not exist
+    """
+    key = job_key(job_id)
+    
+    async with r.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                await pipe.watch(key)
+                current = await pipe.hget(key, "status")
+                
+                if current not in from_statuses:
+                    await pipe.unwatch()
+                    return current
+                
+                pipe.multi()
+                pipe.hset(key, mapping={field: _encode(value) for field, value in fields.items()})
+                if finish:
+                    pipe.srem(ACTIVE_JOBS_KEY, job_id)
+                if cancel:
+                    pipe.set(cancel_key(job_id), 1, ex=settings.ANALYSIS_JOB_TTL)
+                await pipe.execute()
+                return current
+            except WatchError:
+                continue
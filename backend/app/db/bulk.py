@@ -0,0 +1,93 @@
+"""
+Bulk loading of structural model geometry
+
+Model imports insert thousands of nodes and elements. These helpers build
+plain row dicts with client-generated ids and insert them with one Core
+executemany per table, which SQLAlchemy sends as batched multi-row
+INSERTs, instead of going through the ORM unit of work row by row.
+"""
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID, uuid4
+
+from app.models.project import Node, Element
+
+def new_ids(count: int) -> List[UUID]:
+    """Random primary keys for count rows"""
+    return [uuid4() for _ in range(count)]
+
+def bulk_load_nodes(
+    session: Session,
+    model_id: UUID,
+    node_numbers: np.ndarray,
+    coords: np.ndarray,
+    restraints: Optional[List[Dict[str, bool]]] = None
+) -> List[UUID]:
+    """
+    Insert the nodes of a model in one executemany
+    
+    Args:
+        session: Database session; the caller commits
+        model_id: Structural model the nodes belong to
+        node_numbers: User-defined node numbers (n,)
+        coords: Node coordinates (n, 3)
+        restraints: Optional restraint dict per node
+    
+    Returns:
+        Primary keys of the inserted nodes, in input order
+    """
+    ids = new_ids(len(node_numbers))
+    restraints = restraints if restraints is not None else [{}] * len(ids)
+    
+    records = [
+        dict(id=node_id, model_id=model_id, node_id=number, x=x, y=y, z=z, restraints=node_restraints)
+        for node_id, number, (x, y, z), node_restraints in zip(
+            ids, np.asarray(node_numbers).tolist(), np.asarray(coords, dtype=np.float64).tolist(), restraints
+        )
+    ]
+    
+    if records:
+        session.execute(insert(Node), records)
+    
+    return ids
+
+def bulk_load_elements(session: Session, model_id: UUID, elements: Iterable[Dict[str, Any]]) -> List[UUID]:
+    """
+    Insert the elements of a model in one executemany
+    
+    Args:
+        session: Database session; the caller commits
+        model_id: Structural model the elements belong to
+        elements: Element column values (element_id, element_type,
+            start_node_id, end_node_id and optionally material_id,
+            section_id, properties, orientation), e.g. ElementBase dicts
+    
+    Returns:
+        Primary keys of the inserted elements, in input order
+    """
+    records = [
+        dict(
+            element_id=element['element_id'],
+            element_type=element['element_type'],
+            start_node_id=element['start_node_id'],
+            end_node_id=element['end_node_id'],
+            material_id=element.get('material_id'),
+            section_id=element.get('section_id'),
+            properties=element.get('properties') or {},
+            orientation=element.get('orientation') or {},
+            model_id=model_id
+        )
+        for element in elements
+    ]
+    
+    ids = new_ids(len(records))
+    for record, element_id in zip(records, ids):
+        record['id'] = element_id
+    
+    if records:
+        session.execute(insert(Element), records)
+    
+    return ids
@@ -2,35 +2,107 @@
 Database configuration and session management
 """
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, make_url, text, Engine, MetaData, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 import logging
+import orjson
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# PostgreSQL engine (main database)
+# orjson options for stored JSON: NumPy scalars/arrays and non-string dict keys
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def json_serializer(value) -> str:
+    """Serialize JSON column values with orjson (handles NumPy scalars/arrays)"""
+    return orjson.dumps(value, option=JSON_OPTIONS).decode()
+
+# PostgreSQL engine (main database). Concurrent API requests and analysis
+# workers each hold a connection; LIFO checkout reuses the most recently
+# returned connection so idle ones can be recycled
 engine = create_engine(
     settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_OVERFLOW,
+    pool_use_lifo=True,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads
+)
+
+# asyncio driver of each supported database backend (both in requirements.txt:
+# the async engine is created at import, also in the workers and scripts)
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_database_url(url: str) -> URL:
+    """The given database URL with the asyncio driver of its backend"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver known for {backend} databases; set ASYNC_DATABASE_URL")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+# Async engine for the request-serving path, so route handlers await their
+# queries instead of blocking the event loop. The sync engine above remains
+# for create_all and the Celery analysis workers
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_OVERFLOW,
+    pool_use_lifo=True,
     pool_pre_ping=True,
     pool_recycle=300,
-    echo=settings.DEBUG
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # SQLite engine (cache/local storage)
 sqlite_engine = create_engine(
     settings.SQLITE_URL,
     poolclass=StaticPool,
-    connect_args={"check_same_thread": False},
-    echo=settings.DEBUG
+    connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT},
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads
 )
 
+# Cache database pragmas: WAL lets readers proceed during writes, NORMAL
+# sync is durable enough in WAL mode for a cache, and reads go through a
+# 256 MiB memory map and a 64 MiB page cache
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+@event.listens_for(sqlite_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply SQLITE_PRAGMAS to every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+if settings.SQL_TRACE:
+    sql_logger = logging.getLogger(f"{__name__}.sql")
+    
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _trace_sql(conn, cursor, statement, parameters, context, executemany) -> None:
+        """Log each statement (without its parameters, which can be a whole bulk insert)"""
+        sql_logger.debug("%s %s (executemany=%s)", conn.engine.dialect.name, statement, executemany)
+
 # Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 SQLiteSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)
+# Instances stay loaded after commit: lazy attribute refreshes are not
+# possible on an AsyncSession
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -46,6 +118,11 @@ def get_db() -> Session:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncSession:
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def get_sqlite_db() -> Session:
     """Get SQLite database session"""
     db = SQLiteSessionLocal()
@@ -54,11 +131,25 @@ def get_sqlite_db() -> Session:
     finally:
         db.close()
 
+# PostgreSQL advisory lock key serializing schema creation across processes
+SCHEMA_LOCK_KEY = 0x5374724D
+
 def init_db():
     """Initialize database"""
     try:
-        Base.metadata.create_all(bind=engine)
-        Base.metadata.create_all(bind=sqlite_engine)
+        with engine.begin() as connection:
+            if engine.dialect.name == "postgresql":
+                # API workers start together; the first to take the lock
+                # creates the schema and the others then find it in place
+                connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+                # Server-side primary keys use gen_random_uuid(), built in from
+                # PostgreSQL 13 and provided by pgcrypto before that
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
+                # The schema DDL commits once; no need to wait for its WAL flush
+                connection.execute(text("SET LOCAL synchronous_commit = off"))
+            Base.metadata.create_all(bind=connection)
+            # Still under the lock, which also covers the workers' shared cache file
+            Base.metadata.create_all(bind=sqlite_engine)
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
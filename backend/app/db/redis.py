@@ -0,0 +1,14 @@
+"""
+Redis connection management
+"""
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+# Shared async client (connections are pooled per event loop)
+redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+async def get_redis() -> Redis:
+    """Get Redis client"""
+    return redis_client
@@ -2,11 +2,55 @@
 Base model classes and mixins
 """
 
-from sqlalchemy import Column, Integer, DateTime, String, Boolean
+from sqlalchemy import Column, Integer, DateTime, Boolean, LargeBinary, Uuid
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.sql import func
-from app.db.database import Base
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
+from app.db.database import Base, JSON_OPTIONS
+import orjson
 import uuid
+import zlib
+
+# zlib level for compressed JSON columns: most of the size reduction of the
+# higher levels at a fraction of their compression time
+JSON_COMPRESSION_LEVEL = 3
+
+class gen_random_uuid(FunctionElement):
+    """Database-side random UUID generation"""
+    type = Uuid()
+    inherit_cache = True
+
+@compiles(gen_random_uuid, "postgresql")
+def _gen_random_uuid_postgresql(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+@compiles(gen_random_uuid)
+def _gen_random_uuid_default(element, compiler, **kw):
+    # 32 random hex digits: the CHAR(32) storage format of Uuid without a native type
+    return "(lower(hex(randomblob(16))))"
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON value stored as zlib-compressed orjson bytes
+    
+    For large, write-once result documents: the stored blob is several
+    times smaller than JSON text, and reading it is one decompress and one
+    orjson parse without database-side JSON handling.
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(orjson.dumps(value, option=JSON_OPTIONS), JSON_COMPRESSION_LEVEL)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return orjson.loads(zlib.decompress(value))
 
 class TimestampMixin:
     """Mixin for timestamp fields"""
@@ -14,10 +58,16 @@ class TimestampMixin:
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 class UUIDMixin:
-    """Mixin for UUID primary key"""
+    """Mixin for a native UUID primary key generated by the client, known before the INSERT"""
+    @declared_attr
+    def id(cls):
+        return Column(Uuid, primary_key=True, default=uuid.uuid4)
+
+class NativeUUIDMixin:
+    """Mixin for a native UUID primary key generated by the database"""
     @declared_attr
     def id(cls):
-        return Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+        return Column(Uuid, primary_key=True, server_default=gen_random_uuid())
 
 class BaseModel(Base, TimestampMixin, UUIDMixin):
     """Base model class"""
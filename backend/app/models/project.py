@@ -2,17 +2,20 @@
 Project and structural model database models
 """
 
-from sqlalchemy import Column, String, Text, ForeignKey, JSON, Float, Integer, Boolean
-from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from sqlalchemy import Column, String, Text, ForeignKey, JSON, Float, Integer, Boolean, Index, UniqueConstraint, Uuid, text
+from sqlalchemy.orm import relationship, deferred
+from app.models.base import BaseModel, CompressedJSON, NativeUUIDMixin
 
-class Project(BaseModel):
+class Project(NativeUUIDMixin, BaseModel):
     """Project model"""
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_owner_active", "owner_id", "is_active", "id", postgresql_where=text("is_active")),
+    )
     
     name = Column(String, nullable=False)
     description = Column(Text)
-    owner_id = Column(String, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
     project_type = Column(String, default="building")  # building, bridge, industrial
     units = Column(String, default="metric")  # metric, imperial
     design_code = Column(String, default="AISC")  # AISC, EC3, etc.
@@ -24,13 +27,16 @@ class Project(BaseModel):
     owner = relationship("User", back_populates="projects")
     structural_models = relationship("StructuralModel", back_populates="project")
 
-class StructuralModel(BaseModel):
+class StructuralModel(NativeUUIDMixin, BaseModel):
     """Structural model containing nodes, elements, etc."""
     __tablename__ = "structural_models"
+    __table_args__ = (
+        Index("ix_models_project_active", "project_id", "is_active", postgresql_where=text("is_active")),
+    )
     
     name = Column(String, nullable=False)
     description = Column(Text)
-    project_id = Column(String, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Uuid, ForeignKey("projects.id"), nullable=False)
     
     # Model properties
     model_type = Column(String, default="3d_frame")  # 3d_frame, 2d_frame, truss, shell
@@ -52,8 +58,12 @@ class StructuralModel(BaseModel):
 class Node(BaseModel):
     """Structural node/joint"""
     __tablename__ = "nodes"
+    __table_args__ = (
+        # Also serves the model.nodes lookup by model_id alone
+        UniqueConstraint("model_id", "node_id", name="uq_nodes_model_node"),
+    )
     
-    model_id = Column(String, ForeignKey("structural_models.id"), nullable=False)
+    model_id = Column(Uuid, ForeignKey("structural_models.id"), nullable=False)
     node_id = Column(Integer, nullable=False)  # User-defined node number
     
     # Coordinates
@@ -73,20 +83,27 @@ class Node(BaseModel):
 class Element(BaseModel):
     """Structural element (beam, column, brace, etc.)"""
     __tablename__ = "elements"
-    
-    model_id = Column(String, ForeignKey("structural_models.id"), nullable=False)
+    __table_args__ = (
+        # Also serves the model.elements lookup by model_id alone
+        UniqueConstraint("model_id", "element_id", name="uq_elements_model_element"),
+        Index("ix_elements_model_type", "model_id", "element_type"),
+        Index("ix_elements_start_node", "start_node_id"),
+        Index("ix_elements_end_node", "end_node_id"),
+    )
+    
+    model_id = Column(Uuid, ForeignKey("structural_models.id"), nullable=False)
     element_id = Column(Integer, nullable=False)  # User-defined element number
     
     # Connectivity
-    start_node_id = Column(String, ForeignKey("nodes.id"), nullable=False)
-    end_node_id = Column(String, ForeignKey("nodes.id"), nullable=False)
+    start_node_id = Column(Uuid, ForeignKey("nodes.id"), nullable=False)
+    end_node_id = Column(Uuid, ForeignKey("nodes.id"), nullable=False)
     
     # Element type
     element_type = Column(String, nullable=False)  # beam, column, brace, shell, etc.
     
     # Material and section
-    material_id = Column(String, ForeignKey("materials.id"))
-    section_id = Column(String, ForeignKey("sections.id"))
+    material_id = Column(Uuid, ForeignKey("materials.id"))
+    section_id = Column(Uuid, ForeignKey("sections.id"))
     
     # Element properties
     properties = Column(JSON, default={})
@@ -104,8 +121,11 @@ class Element(BaseModel):
 class Material(BaseModel):
     """Material properties"""
     __tablename__ = "materials"
+    __table_args__ = (
+        Index("ix_materials_model", "model_id"),
+    )
     
-    model_id = Column(String, ForeignKey("structural_models.id"), nullable=False)
+    model_id = Column(Uuid, ForeignKey("structural_models.id"), nullable=False)
     name = Column(String, nullable=False)
     material_type = Column(String, nullable=False)  # steel, concrete, composite, etc.
     
@@ -129,8 +149,11 @@ class Material(BaseModel):
 class Section(BaseModel):
     """Cross-section properties"""
     __tablename__ = "sections"
+    __table_args__ = (
+        Index("ix_sections_model", "model_id"),
+    )
     
-    model_id = Column(String, ForeignKey("structural_models.id"), nullable=False)
+    model_id = Column(Uuid, ForeignKey("structural_models.id"), nullable=False)
     name = Column(String, nullable=False)
     section_type = Column(String, nullable=False)  # I-beam, HSS, angle, etc.
     
@@ -154,8 +177,11 @@ class Section(BaseModel):
 class LoadCase(BaseModel):
     """Load case definition"""
     __tablename__ = "load_cases"
+    __table_args__ = (
+        Index("ix_load_cases_model", "model_id"),
+    )
     
-    model_id = Column(String, ForeignKey("structural_models.id"), nullable=False)
+    model_id = Column(Uuid, ForeignKey("structural_models.id"), nullable=False)
     name = Column(String, nullable=False)
     load_type = Column(String, nullable=False)  # dead, live, wind, seismic, etc.
     
@@ -168,22 +194,32 @@ class LoadCase(BaseModel):
     # Relationships
     model = relationship("StructuralModel", back_populates="load_cases")
 
-class AnalysisResult(BaseModel):
+class AnalysisResult(NativeUUIDMixin, BaseModel):
     """Analysis results storage"""
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        # Keyset pagination of a model's results, newest first
+        Index("ix_analysis_results_model_created", "model_id", "created_at", "id"),
+        Index("ix_analysis_results_model_load_case", "model_id", "load_case_id"),
+    )
     
-    model_id = Column(String, ForeignKey("structural_models.id"), nullable=False)
+    model_id = Column(Uuid, ForeignKey("structural_models.id"), nullable=False)
     analysis_type = Column(String, nullable=False)
-    load_case_id = Column(String, ForeignKey("load_cases.id"))
+    load_case_id = Column(Uuid, ForeignKey("load_cases.id"))
     
-    # Results data
-    node_results = Column(JSON, default={})     # Displacements, reactions
-    element_results = Column(JSON, default={})  # Forces, moments, stresses
+    # Results data (large blobs; only loaded when accessed)
+    node_results = deferred(Column(CompressedJSON, default={}), group="results")     # Displacements, reactions
+    element_results = deferred(Column(CompressedJSON, default={}), group="results")  # Forces, moments, stresses
     
     # Analysis metadata
     analysis_time = Column(Float)
     convergence_info = Column(JSON, default={})
     
+    # Summary statistics (computed once when results are saved)
+    max_displacement = Column(Float, default=0.0)
+    max_stress = Column(Float, default=0.0)
+    max_reaction = Column(Float, default=0.0)
+    
     # Relationships
     model = relationship("StructuralModel", back_populates="analysis_results")
     load_case = relationship("LoadCase")
@@ -2,11 +2,33 @@
 Pydantic schemas for analysis-related API models
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator, TypeAdapter, WithJsonSchema
+from typing import Annotated, Optional, Dict, Any, List
 from datetime import datetime
+from uuid import UUID
 from enum import Enum
 
+# Nodal degrees of freedom, in DOF index order (3 translations + 3 rotations);
+# also the column order of nodal result arrays
+DOF_NAMES = ['dx', 'dy', 'dz', 'rx', 'ry', 'rz']
+
+# Node numbers (N,); a list of ints when serialized to JSON
+NodeIdArray = Annotated[
+    np.ndarray,
+    PlainValidator(lambda value: np.asarray(value, dtype=np.int32).reshape(-1)),
+    PlainSerializer(lambda array: array.tolist(), return_type=List[int], when_used="json"),
+    WithJsonSchema(TypeAdapter(List[int]).json_schema())
+]
+
+# Nodal values (N, 6), columns in DOF_NAMES order; a list of rows when serialized to JSON
+NodeValueArray = Annotated[
+    np.ndarray,
+    PlainValidator(lambda value: np.asarray(value, dtype=np.float64).reshape(-1, len(DOF_NAMES))),
+    PlainSerializer(lambda array: array.tolist(), return_type=List[List[float]], when_used="json"),
+    WithJsonSchema(TypeAdapter(List[List[float]]).json_schema())
+]
+
 class AnalysisType(str, Enum):
     """Analysis types"""
     LINEAR = "linear"
@@ -31,6 +53,7 @@ class AnalysisSettings(BaseModel):
     include_pdelta: bool = False
     include_geometric_nonlinearity: bool = False
     include_material_nonlinearity: bool = False
+    mixed_precision: bool = False  # float32 factorization with float64 refinement (float32 Newton steps)
     
     # Dynamic analysis settings
     time_step: Optional[float] = Field(None, gt=0)
@@ -46,8 +69,8 @@ class AnalysisSettings(BaseModel):
 
 class AnalysisRequest(BaseModel):
     """Analysis request schema"""
-    model_id: str
-    load_case_ids: List[str] = Field(..., min_items=1)
+    model_id: UUID
+    load_case_ids: List[UUID] = Field(..., min_length=1)
     settings: AnalysisSettings = Field(default_factory=AnalysisSettings)
     save_results: bool = True
 
@@ -62,48 +85,101 @@ class AnalysisStatus(str, Enum):
 class AnalysisJob(BaseModel):
     """Analysis job schema"""
     id: str
-    model_id: str
+    model_id: UUID
     status: AnalysisStatus
     progress: float = Field(ge=0, le=100)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class NodeResult(BaseModel):
     """Node analysis results"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     node_id: int
     displacements: Dict[str, float] = Field(default_factory=dict)  # dx, dy, dz, rx, ry, rz
     reactions: Dict[str, float] = Field(default_factory=dict)      # Fx, Fy, Fz, Mx, My, Mz
 
 class ElementResult(BaseModel):
     """Element analysis results"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     element_id: int
     forces: Dict[str, float] = Field(default_factory=dict)    # Axial, shear, moment
     stresses: Dict[str, float] = Field(default_factory=dict)  # Normal, shear stresses
     strains: Dict[str, float] = Field(default_factory=dict)   # Normal, shear strains
 
+# Validate stored result rows as a whole list in one call
+NODE_RESULT_LIST_ADAPTER = TypeAdapter(List[NodeResult])
+ELEMENT_RESULT_LIST_ADAPTER = TypeAdapter(List[ElementResult])
+
+def node_result_columns(node_results: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Node ids, displacements and reactions arrays of stored node results keyed by node number"""
+    entries = list(node_results.values())
+    
+    return {
+        'node_ids': np.fromiter(map(int, node_results), dtype=np.int32, count=len(entries)),
+        'displacements': np.array(
+            [[entry.get('displacements', {}).get(name, 0.0) for name in DOF_NAMES] for entry in entries],
+            dtype=np.float64
+        ).reshape(-1, len(DOF_NAMES)),
+        'reactions': np.array(
+            [[entry.get('reactions', {}).get(name, 0.0) for name in DOF_NAMES] for entry in entries],
+            dtype=np.float64
+        ).reshape(-1, len(DOF_NAMES))
+    }
+
 class AnalysisResults(BaseModel):
-    """Complete analysis results"""
-    model_id: str
-    load_case_id: str
+    """
+    Complete analysis results
+    
+    Node results are held as columns: node_ids and one (N, 6) array each for
+    displacements and reactions, converted to lists only when serialized.
+    """
+    model_id: UUID
+    load_case_id: UUID
     analysis_type: str
-    node_results: List[NodeResult] = Field(default_factory=list)
+    node_ids: NodeIdArray = Field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    displacements: NodeValueArray = Field(default_factory=lambda: np.empty((0, len(DOF_NAMES))))
+    reactions: NodeValueArray = Field(default_factory=lambda: np.empty((0, len(DOF_NAMES))))
     element_results: List[ElementResult] = Field(default_factory=list)
     analysis_time: float
     convergence_info: Dict[str, Any] = Field(default_factory=dict)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @property
+    def node_results(self) -> List[NodeResult]:
+        """Per-node result objects, built on demand from the columns"""
+        return NODE_RESULT_LIST_ADAPTER.validate_python([
+            {
+                'node_id': node_id,
+                'displacements': dict(zip(DOF_NAMES, displacements)),
+                'reactions': dict(zip(DOF_NAMES, reactions))
+            }
+            for node_id, displacements, reactions in zip(
+                self.node_ids.tolist(), self.displacements.tolist(), self.reactions.tolist()
+            )
+        ])
+    
+    @property
+    def max_displacement(self) -> float:
+        """Largest absolute displacement component"""
+        return float(np.abs(self.displacements).max(initial=0.0))
+    
+    @property
+    def max_reaction(self) -> float:
+        """Largest absolute reaction component"""
+        return float(np.abs(self.reactions).max(initial=0.0))
 
 class AnalysisResultSummary(BaseModel):
     """Analysis result summary"""
-    id: str
-    model_id: str
+    id: UUID
+    model_id: UUID
     analysis_type: str
-    load_case_id: str
+    load_case_id: UUID
     analysis_time: float
     created_at: datetime
     
@@ -112,5 +188,4 @@ class AnalysisResultSummary(BaseModel):
     max_stress: float
     max_reaction: float
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -2,9 +2,11 @@
 Pydantic schemas for design-related API models
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Literal, Tuple
 from datetime import datetime
+from uuid import UUID
 from enum import Enum
 
 class DesignCode(str, Enum):
@@ -46,9 +48,9 @@ class DesignSettings(BaseModel):
 
 class DesignRequest(BaseModel):
     """Design request schema"""
-    model_id: str
-    element_ids: List[str] = Field(..., min_items=1)
-    analysis_result_id: str
+    model_id: UUID
+    element_ids: List[UUID] = Field(..., min_length=1)
+    analysis_result_id: UUID
     settings: DesignSettings = Field(default_factory=DesignSettings)
 
 class DesignCheckType(str, Enum):
@@ -61,38 +63,41 @@ class DesignCheckType(str, Enum):
     DEFLECTION = "deflection"
     VIBRATION = "vibration"
 
+# Outcome of a check or element; validated as a literal set, not a free string
+DesignStatus = Literal["PASS", "FAIL", "WARNING"]
+
 class DesignCheckResult(BaseModel):
     """Individual design check result"""
     check_type: DesignCheckType
     demand: float
     capacity: float
     ratio: float = Field(ge=0)
-    status: str  # "PASS", "FAIL", "WARNING"
+    status: DesignStatus
     governing_equation: Optional[str] = None
     details: Dict[str, Any] = Field(default_factory=dict)
 
 class ElementDesignResult(BaseModel):
     """Design results for a single element"""
-    element_id: str
+    element_id: UUID
     element_type: str
     section_name: str
     material_name: str
     
-    # Design checks
-    design_checks: List[DesignCheckResult] = Field(default_factory=list)
+    # Design checks (read-only once built)
+    design_checks: Tuple[DesignCheckResult, ...] = ()
     
     # Overall results
     controlling_ratio: float = Field(ge=0)
     controlling_check: Optional[str] = None
-    overall_status: str  # "PASS", "FAIL", "WARNING"
+    overall_status: DesignStatus
     
     # Recommendations
-    recommendations: List[str] = Field(default_factory=list)
+    recommendations: Tuple[str, ...] = ()
 
 class DesignResults(BaseModel):
     """Complete design results"""
-    model_id: str
-    analysis_result_id: str
+    model_id: UUID
+    analysis_result_id: UUID
     design_code: str
     element_results: List[ElementDesignResult] = Field(default_factory=list)
     
@@ -104,20 +109,21 @@ class DesignResults(BaseModel):
     
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    # Validators are built on first use rather than at import
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 class SectionOptimization(BaseModel):
     """Section optimization request"""
-    element_ids: List[str]
+    element_ids: List[UUID]
     target_ratio: float = Field(default=0.9, ge=0.1, le=1.0)
     available_sections: List[str] = Field(default_factory=list)
     optimize_weight: bool = True
     optimize_cost: bool = False
 
-class OptimizationResult(BaseModel):
-    """Section optimization result"""
-    element_id: str
+@dataclass(frozen=True, slots=True, kw_only=True)
+class OptimizationResult:
+    """Section optimization result (one per element; slotted, no per-instance dict)"""
+    element_id: UUID
     original_section: str
     optimized_section: str
     weight_savings: float
@@ -2,9 +2,14 @@
 Pydantic schemas for project-related API models
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+from uuid import UUID
+
+# Read-only response models, read from ORM objects. Their validators are built
+# on first use instead of at import, so models no route returns cost nothing
+_RESPONSE_CONFIG = ConfigDict(from_attributes=True, defer_build=True)
 
 class ProjectBase(BaseModel):
     """Base project schema"""
@@ -30,14 +35,13 @@ class ProjectUpdate(BaseModel):
 
 class Project(ProjectBase):
     """Schema for project response"""
-    id: str
-    owner_id: str
+    id: UUID
+    owner_id: UUID
     created_at: datetime
     updated_at: Optional[datetime]
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = _RESPONSE_CONFIG
 
 class StructuralModelBase(BaseModel):
     """Base structural model schema"""
@@ -50,7 +54,7 @@ class StructuralModelBase(BaseModel):
 
 class StructuralModelCreate(StructuralModelBase):
     """Schema for creating a structural model"""
-    project_id: str
+    project_id: UUID
 
 class StructuralModelUpdate(BaseModel):
     """Schema for updating a structural model"""
@@ -63,14 +67,22 @@ class StructuralModelUpdate(BaseModel):
 
 class StructuralModel(StructuralModelBase):
     """Schema for structural model response"""
-    id: str
-    project_id: str
+    id: UUID
+    project_id: UUID
     created_at: datetime
     updated_at: Optional[datetime]
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = _RESPONSE_CONFIG
+
+class Restraints(BaseModel):
+    """Nodal DOF restraints (True where the DOF is fixed)"""
+    dx: bool = False
+    dy: bool = False
+    dz: bool = False
+    rx: bool = False
+    ry: bool = False
+    rz: bool = False
 
 class NodeBase(BaseModel):
     """Base node schema"""
@@ -78,45 +90,43 @@ class NodeBase(BaseModel):
     x: float
     y: float
     z: float
-    restraints: Dict[str, bool] = Field(default_factory=dict)
+    restraints: Restraints = Field(default_factory=Restraints)
     properties: Dict[str, Any] = Field(default_factory=dict)
 
 class NodeCreate(NodeBase):
     """Schema for creating a node"""
-    model_id: str
+    model_id: UUID
 
 class Node(NodeBase):
     """Schema for node response"""
-    id: str
-    model_id: str
+    id: UUID
+    model_id: UUID
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = _RESPONSE_CONFIG
 
 class ElementBase(BaseModel):
     """Base element schema"""
     element_id: int
     element_type: str
-    start_node_id: str
-    end_node_id: str
-    material_id: Optional[str] = None
-    section_id: Optional[str] = None
+    start_node_id: UUID
+    end_node_id: UUID
+    material_id: Optional[UUID] = None
+    section_id: Optional[UUID] = None
     properties: Dict[str, Any] = Field(default_factory=dict)
     orientation: Dict[str, Any] = Field(default_factory=dict)
 
 class ElementCreate(ElementBase):
     """Schema for creating an element"""
-    model_id: str
+    model_id: UUID
 
 class Element(ElementBase):
     """Schema for element response"""
-    id: str
-    model_id: str
+    id: UUID
+    model_id: UUID
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = _RESPONSE_CONFIG
 
 class MaterialBase(BaseModel):
     """Base material schema"""
@@ -133,16 +143,15 @@ class MaterialBase(BaseModel):
 
 class MaterialCreate(MaterialBase):
     """Schema for creating a material"""
-    model_id: str
+    model_id: UUID
 
 class Material(MaterialBase):
     """Schema for material response"""
-    id: str
-    model_id: str
+    id: UUID
+    model_id: UUID
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = _RESPONSE_CONFIG
 
 class LoadCaseBase(BaseModel):
     """Base load case schema"""
@@ -153,13 +162,12 @@ class LoadCaseBase(BaseModel):
 
 class LoadCaseCreate(LoadCaseBase):
     """Schema for creating a load case"""
-    model_id: str
+    model_id: UUID
 
 class LoadCase(LoadCaseBase):
     """Schema for load case response"""
-    id: str
-    model_id: str
+    id: UUID
+    model_id: UUID
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = _RESPONSE_CONFIG
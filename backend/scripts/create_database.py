@@ -2,34 +2,34 @@
 Database creation and initialization script
 """
 
-import sys
-from pathlib import Path
-
-# Add the app directory to Python path
-sys.path.append(str(Path(__file__).parent.parent / "app"))
-
 from sqlalchemy import create_engine, text
+from passlib.context import CryptContext
 from app.core.config import settings
-from app.db.database import Base, engine
+from app.db.database import Base, engine, init_db
 from app.models import user, project  # Import all models
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# bcrypt cost of the seeded admin password: the minimum in development, where
+# databases are recreated often, and the usual cost otherwise
+SEED_BCRYPT_ROUNDS = 4 if settings.DEBUG else 12
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=SEED_BCRYPT_ROUNDS)
+
 def create_database():
     """Create database and tables"""
     try:
         logger.info("Creating database tables...")
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Same schema setup as the API startup (pgcrypto, one DDL transaction)
+        init_db()
         
         logger.info("Database tables created successfully")
         
         # Create initial superuser if needed
         create_initial_user()
-        
+    
     except Exception as e:
         logger.error(f"Failed to create database: {e}")
         raise
@@ -38,7 +38,6 @@ def create_initial_user():
     """Create initial superuser"""
     from sqlalchemy.orm import sessionmaker
     from app.models.user import User
-    from passlib.context import CryptContext
     
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
@@ -50,9 +49,6 @@ def create_initial_user():
             logger.info("Users already exist, skipping initial user creation")
             return
         
-        # Create password context
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        
         # Create initial superuser
         initial_user = User(
             email="admin@strumind.com",
@@ -67,7 +63,7 @@ def create_initial_user():
         db.commit()
         
         logger.info("Initial superuser created: admin@strumind.com / admin123")
-        
+    
     except Exception as e:
         logger.error(f"Failed to create initial user: {e}")
         db.rollback()
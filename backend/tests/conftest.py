@@ -0,0 +1,71 @@
+"""
+Shared test fixtures
+
+The tests run against a throwaway SQLite database, so the settings are
+pointed at it before any app module is imported.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+_TEST_DIR = Path(tempfile.mkdtemp(prefix="strumind-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DIR / 'strumind.db'}"
+os.environ["SQLITE_URL"] = f"sqlite:///{_TEST_DIR / 'strumind_cache.db'}"
+
+import pytest
+import pytest_asyncio
+from fakeredis import aioredis as fake_aioredis
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
+
+from app.db.database import AsyncSessionLocal, Base, async_engine, engine
+from app.models import project, user  # Register all tables
+
+@pytest.fixture
+def tables():
+    """Empty tables for one test"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest_asyncio.fixture
+async def db(tables):
+    """AsyncSession in which any lazy relationship load raises"""
+    async with AsyncSessionLocal() as session:
+        @event.listens_for(session.sync_session, "do_orm_execute")
+        def _raiseload_all(orm_execute_state):
+            if orm_execute_state.is_select:
+                orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+        
+        yield session
+    
+    # Each test runs in its own event loop; pooled connections belong to this one
+    await async_engine.dispose()
+
+@pytest_asyncio.fixture
+async def redis():
+    """In-memory Redis"""
+    r = fake_aioredis.FakeRedis(decode_responses=True)
+    yield r
+    await r.flushall()
+    await r.aclose()
+
+@pytest.fixture
+def count_queries():
+    """Context manager collecting the SQL statements sent through the async engine"""
+    @contextmanager
+    def counter():
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    
+    return counter
@@ -0,0 +1,66 @@
+"""
+Nodal loads read from the JSON loads column of a load case
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+
+from app.core.analysis.engine import AnalysisEngine
+
+FIXED = {dof_name: True for dof_name in ("dx", "dy", "dz", "rx", "ry", "rz")}
+
+def portal_frame(loads):
+    """Two fixed columns and a beam, with one load case holding the given loads"""
+    nodes = [
+        SimpleNamespace(id=uuid4(), node_id=number, x=x, y=y, z=0.0, restraints=restraints)
+        for number, (x, y, restraints) in enumerate(
+            [(0.0, 0.0, FIXED), (0.0, 3000.0, {}), (6000.0, 3000.0, {}), (6000.0, 0.0, FIXED)], start=1
+        )
+    ]
+    material = SimpleNamespace(
+        id=uuid4(), name="S355", material_type="steel", elastic_modulus=200000.0, shear_modulus=80000.0,
+        poisson_ratio=0.3, density=7850.0, yield_strength=355.0, ultimate_strength=490.0, properties={}
+    )
+    section = SimpleNamespace(
+        id=uuid4(), name="W", section_type="I-beam", area=5000.0, moment_inertia_y=2e7, moment_inertia_z=5e7,
+        torsional_constant=1e5, section_modulus_y=2e5, section_modulus_z=5e5, dimensions={}, properties={}
+    )
+    elements = [
+        SimpleNamespace(
+            id=uuid4(), element_id=number, element_type="beam", start_node_id=start.id, end_node_id=end.id,
+            material_id=material.id, section_id=section.id
+        )
+        for number, (start, end) in enumerate(zip(nodes, nodes[1:]), start=1)
+    ]
+    load_case = SimpleNamespace(id=uuid4(), name="Wind", load_type="wind", loads=loads, properties={})
+    model = SimpleNamespace(
+        id=uuid4(), nodes=nodes, elements=elements, materials=[material], sections=[section], load_cases=[load_case]
+    )
+    return model, load_case
+
+def test_nodal_loads_with_string_node_ids_are_applied():
+    model, load_case = portal_frame([])
+    # As read back from the JSON column: node ids are strings
+    load_case.loads = [{"type": "nodal", "node_id": str(model.nodes[1].id), "forces": {"Fx": 10000.0}}]
+    
+    engine = AnalysisEngine(model)
+    engine.prepare_model()
+    F = engine.assemble_load_vector(load_case.id)
+    
+    assert np.isclose(F.sum(), 10000.0)
+    displacements = engine.solve_system(engine.assemble_global_stiffness(), F)
+    assert np.abs(displacements).max() > 0.0
+
+def test_nodal_loads_on_unknown_or_malformed_node_ids_are_skipped():
+    model, load_case = portal_frame([
+        {"type": "nodal", "node_id": str(uuid4()), "forces": {"Fx": 1.0}},
+        {"type": "nodal", "node_id": "not-a-uuid", "forces": {"Fx": 1.0}},
+        {"type": "nodal", "node_id": None, "forces": {"Fx": 1.0}},
+    ])
+    
+    engine = AnalysisEngine(model)
+    engine.prepare_model()
+    
+    assert not engine.assemble_load_vector(load_case.id).any()
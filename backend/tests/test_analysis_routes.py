@@ -0,0 +1,153 @@
+"""
+Statements issued by the analysis routes
+"""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes import analysis
+from app.models.project import AnalysisResult, LoadCase, Project, StructuralModel
+from app.models.user import User
+from app.schemas.analysis import AnalysisRequest
+
+async def add_model(db, username="owner"):
+    """A user owning a project with one structural model and load case"""
+    owner = User(email=f"{username}@example.com", username=username, hashed_password="x")
+    db.add(owner)
+    await db.flush()
+    
+    project = Project(name="Tower", owner_id=owner.id)
+    db.add(project)
+    await db.flush()
+    
+    model = StructuralModel(name="Frame", project_id=project.id)
+    db.add(model)
+    await db.flush()
+    
+    load_case = LoadCase(model_id=model.id, name="Dead", load_type="dead", loads=[])
+    db.add(load_case)
+    await db.commit()
+    return owner, model, load_case
+
+async def add_results(db, model, load_case, created_at):
+    """Analysis results of a model created at the given times"""
+    results = [
+        AnalysisResult(
+            id=uuid4(), model_id=model.id, load_case_id=load_case.id, analysis_type="linear", created_at=timestamp,
+            node_results={}, element_results={}, analysis_time=0.1, max_displacement=1.0
+        )
+        for timestamp in created_at
+    ]
+    db.add_all(results)
+    await db.commit()
+    return results
+
+async def list_results(db, user, model, limit=100, cursor=None, cursor_id=None):
+    """One page of get_analysis_results"""
+    return await analysis.get_analysis_results(
+        model.id, limit=limit, cursor=cursor, cursor_id=cursor_id, db=db, current_user=user
+    )
+
+@pytest.mark.asyncio
+async def test_run_analysis_checks_access_in_one_statement(db, redis, count_queries, monkeypatch):
+    owner, model, load_case = await add_model(db)
+    queued = []
+    monkeypatch.setattr(analysis.run_analysis_job, "delay", lambda *args: queued.append(args))
+    request = AnalysisRequest(model_id=model.id, load_case_ids=[load_case.id])
+    
+    with count_queries() as statements:
+        job = await analysis.run_analysis(request, db=db, r=redis, current_user=owner)
+    
+    assert len(statements) == 1
+    assert job.model_id == model.id
+    assert len(queued) == 1
+
+@pytest.mark.asyncio
+async def test_run_analysis_denies_other_users_in_one_statement(db, redis, count_queries):
+    _, model, load_case = await add_model(db)
+    other = User(email="other@example.com", username="other", hashed_password="x")
+    db.add(other)
+    await db.commit()
+    request = AnalysisRequest(model_id=model.id, load_case_ids=[load_case.id])
+    
+    with count_queries() as statements, pytest.raises(HTTPException) as denied:
+        await analysis.run_analysis(request, db=db, r=redis, current_user=other)
+    
+    assert denied.value.status_code == 403
+    assert len(statements) == 1
+
+@pytest.mark.asyncio
+async def test_result_detail_loads_result_and_owner_in_one_statement(db, count_queries):
+    owner, model, load_case = await add_model(db)
+    result = AnalysisResult(
+        id=uuid4(), model_id=model.id, load_case_id=load_case.id, analysis_type="linear",
+        node_results={"1": {"displacements": {"dx": 1.5}}}, element_results={"1": {"forces": {"axial": 2.0}}},
+        analysis_time=0.1, convergence_info={}
+    )
+    db.add(result)
+    await db.commit()
+    db.expunge_all()
+    
+    with count_queries() as statements:
+        response = await analysis.get_analysis_result_detail(result.id, db=db, current_user=owner)
+    
+    assert len(statements) == 1
+    assert b'"displacements":[[1.5,0.0,0.0,0.0,0.0,0.0]]' in response.body
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n_results", [1, 250])
+async def test_results_list_takes_two_statements_for_any_row_count(db, count_queries, n_results):
+    owner, model, load_case = await add_model(db)
+    start = datetime(2024, 1, 1)
+    await add_results(db, model, load_case, [start + timedelta(seconds=k) for k in range(n_results)])
+    
+    with count_queries() as statements:
+        page = await list_results(db, owner, model, limit=500)
+    
+    # Ownership scalar and the keyset stream
+    assert len(statements) == 2
+    assert len(page) == n_results
+
+@pytest.mark.asyncio
+async def test_results_list_pages_through_cursor_and_cursor_id(db):
+    owner, model, load_case = await add_model(db)
+    start = datetime(2024, 1, 1)
+    # Three results share a timestamp; cursor_id orders them by id
+    created_at = [start + timedelta(seconds=k) for k in (0, 1, 1, 1, 2)]
+    results = await add_results(db, model, load_case, created_at)
+    expected = [result.id for result in sorted(results, key=lambda result: (result.created_at, result.id), reverse=True)]
+    
+    seen = []
+    page = await list_results(db, owner, model, limit=2)
+    while page:
+        seen += [summary.id for summary in page]
+        last = page[-1]
+        page = await list_results(db, owner, model, limit=2, cursor=last.created_at, cursor_id=last.id)
+    
+    assert seen == expected
+
+@pytest.mark.asyncio
+async def test_results_list_cursor_alone_skips_its_whole_timestamp(db):
+    owner, model, load_case = await add_model(db)
+    start = datetime(2024, 1, 1)
+    results = await add_results(db, model, load_case, [start, start + timedelta(seconds=1), start + timedelta(seconds=1)])
+    
+    page = await list_results(db, owner, model, cursor=start + timedelta(seconds=1))
+    
+    assert [summary.id for summary in page] == [results[0].id]
+
+@pytest.mark.asyncio
+async def test_results_list_hides_other_users_models(db, count_queries):
+    _, model, _ = await add_model(db)
+    other = User(email="other@example.com", username="other", hashed_password="x")
+    db.add(other)
+    await db.commit()
+    
+    with count_queries() as statements, pytest.raises(HTTPException) as denied:
+        await list_results(db, other, model)
+    
+    assert denied.value.status_code == 404
+    assert len(statements) == 1
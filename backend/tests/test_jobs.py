@@ -0,0 +1,69 @@
+"""
+Analysis job state transitions in Redis
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.core import jobs
+from app.schemas.analysis import AnalysisStatus
+
+async def add_job(r):
+    """A new pending job"""
+    job_id = str(uuid4())
+    await jobs.create_job(r, {"id": job_id, "model_id": uuid4(), "status": AnalysisStatus.PENDING, "progress": 0.0})
+    return job_id
+
+async def status_of(r, job_id):
+    """Stored status of a job and whether it is still in the active set"""
+    return (await jobs.get_job(r, job_id))["status"], await r.sismember(jobs.ACTIVE_JOBS_KEY, job_id)
+
+@pytest.mark.asyncio
+async def test_job_runs_and_completes(redis):
+    job_id = await add_job(redis)
+    
+    assert await jobs.start_job(redis, job_id, started_at=datetime.utcnow())
+    assert await status_of(redis, job_id) == (AnalysisStatus.RUNNING, True)
+    assert await jobs.finish_job(redis, job_id, status=AnalysisStatus.COMPLETED, progress=100.0)
+    assert await status_of(redis, job_id) == (AnalysisStatus.COMPLETED, False)
+
+@pytest.mark.asyncio
+async def test_job_cancelled_while_queued_is_not_started(redis):
+    job_id = await add_job(redis)
+    
+    assert await jobs.cancel_job(redis, job_id) == AnalysisStatus.PENDING
+    assert not await jobs.start_job(redis, job_id, started_at=datetime.utcnow())
+    assert await status_of(redis, job_id) == (AnalysisStatus.CANCELLED, False)
+    assert await jobs.is_cancelled(redis, job_id)
+
+@pytest.mark.asyncio
+async def test_finish_keeps_a_cancel_that_landed_during_the_run(redis):
+    job_id = await add_job(redis)
+    await jobs.start_job(redis, job_id)
+    
+    assert await jobs.cancel_job(redis, job_id) == AnalysisStatus.RUNNING
+    assert not await jobs.finish_job(redis, job_id, status=AnalysisStatus.COMPLETED, progress=100.0)
+    assert await status_of(redis, job_id) == (AnalysisStatus.CANCELLED, False)
+
+@pytest.mark.asyncio
+async def test_finish_on_a_finished_job_changes_nothing(redis):
+    job_id = await add_job(redis)
+    await jobs.start_job(redis, job_id)
+    await jobs.finish_job(redis, job_id, status=AnalysisStatus.COMPLETED)
+    
+    assert not await jobs.finish_job(redis, job_id, status=AnalysisStatus.FAILED, error_message="late")
+    assert await jobs.cancel_job(redis, job_id) == AnalysisStatus.COMPLETED
+    job = await jobs.get_job(redis, job_id)
+    assert job["status"] == AnalysisStatus.COMPLETED
+    assert job.get("error_message") is None
+
+@pytest.mark.asyncio
+async def test_transitions_on_a_missing_job_do_nothing(redis):
+    job_id = str(uuid4())
+    
+    assert not await jobs.start_job(redis, job_id)
+    assert not await jobs.finish_job(redis, job_id, status=AnalysisStatus.COMPLETED)
+    assert await jobs.cancel_job(redis, job_id) is None
+    assert await jobs.get_job(redis, job_id) is None
@@ -0,0 +1,17 @@
+"""
+When the API schemas build their validators
+"""
+
+import importlib
+
+from app.schemas import design, project
+
+def test_response_schemas_are_built_when_their_router_is_imported():
+    importlib.import_module("app.api.routes.projects")
+    
+    assert project.Project.__pydantic_complete__
+    assert project.StructuralModel.__pydantic_complete__
+
+def test_request_schemas_are_built_at_import():
+    for schema in (project.ProjectCreate, project.ProjectUpdate, project.StructuralModelCreate, design.DesignRequest):
+        assert schema.__pydantic_complete__